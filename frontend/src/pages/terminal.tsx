@@ -392,7 +392,14 @@ export default function GamePage() {
         setPhase("ended");
         setIsLoading(false);
         break;
-        
+
+      case "portrait_ready":
+        // Portrait finished rendering after the score was shown
+        setFinalScore((prev: any) => prev?.annals
+          ? { ...prev, annals: { ...prev.annals, portrait_image_path: msg.data.portrait_image_path } }
+          : prev);
+        break;
+
       case "game_end":
         // Don't change phase yet - wait for final_score
         // This allows the loading indicator to show during narrative generation
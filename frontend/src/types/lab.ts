@@ -36,8 +36,9 @@ export interface LabGeneration {
   choice_id: string;
   choice_text: string | null;
   model: string;
-  system_prompt: string;
-  turn_prompt: string;
+  // Only on single-generation responses, not in /generations lists
+  system_prompt?: string;
+  turn_prompt?: string;
   dice_roll: number | null;
   temperature: number;
   max_tokens: number;
@@ -7,6 +7,7 @@ This is the single source of truth for what a choice does.
 
 import re
 from enum import Enum
+from functools import lru_cache
 from typing import List, Dict, Optional
 
 
@@ -45,6 +46,21 @@ STAY_FOREVER_PATTERNS = [
 ]
 
 
+# Compiled once; the same choice texts are re-checked on every emit/submit
+_LEAVE_RE = re.compile('|'.join(f'(?:{p})' for p in LEAVE_PATTERNS))
+_STAY_FOREVER_RE = re.compile('|'.join(f'(?:{p})' for p in STAY_FOREVER_PATTERNS))
+
+
+@lru_cache(maxsize=256)
+def _intent_for_text(text_lower: str) -> ChoiceIntent:
+    """Pattern match for an open-window choice. LEAVE wins over STAY FOREVER."""
+    if _LEAVE_RE.search(text_lower):
+        return ChoiceIntent.LEAVE_ERA
+    if _STAY_FOREVER_RE.search(text_lower):
+        return ChoiceIntent.STAY_FOREVER
+    return ChoiceIntent.CONTINUE_STORY
+
+
 def detect_choice_intent(choice_text: str, window_open: bool) -> ChoiceIntent:
     """
     Detect intent from the actual choice text.
@@ -66,20 +82,7 @@ def detect_choice_intent(choice_text: str, window_open: bool) -> ChoiceIntent:
     if not choice_text:
         return ChoiceIntent.CONTINUE_STORY
     
-    text_lower = choice_text.lower()
-    
-    # Check for LEAVE patterns
-    for pattern in LEAVE_PATTERNS:
-        if re.search(pattern, text_lower):
-            return ChoiceIntent.LEAVE_ERA
-    
-    # Check for STAY FOREVER patterns
-    for pattern in STAY_FOREVER_PATTERNS:
-        if re.search(pattern, text_lower):
-            return ChoiceIntent.STAY_FOREVER
-    
-    # Default: continue story
-    return ChoiceIntent.CONTINUE_STORY
+    return _intent_for_text(choice_text.lower())
 
 
 def filter_choices(
@@ -101,8 +104,9 @@ def filter_choices(
     Returns:
         Filtered list of valid choices
     """
-    if not window_open:
+    if not window_open or can_stay_meaningfully:
         # Window closed - all choices are valid story choices
+        # Eligible to stay - nothing to remove either
         return choices
     
     filtered = []
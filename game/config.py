@@ -207,6 +207,17 @@ MODES = {
     }
 }
 
+# =============================================================================
+# SAVE STORAGE
+# =============================================================================
+
+# Where GameAPI keeps in-progress saves. Override with SAVE_BACKEND env var
+# "database" - PostgreSQL via db_storage (web deployments, default)
+# "sqlite"   - local SQLite file in WAL mode (single-server / local play)
+# "files"    - one JSON file per save (single-user local play)
+SAVE_BACKEND = os.environ.get("SAVE_BACKEND", "database").lower()
+SQLITE_SAVE_PATH = os.environ.get("SQLITE_SAVE_PATH", "saves.db")
+
 # =============================================================================
 # DISPLAY SETTINGS
 # =============================================================================
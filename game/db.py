@@ -5,34 +5,152 @@ Replaces the Node.js/Drizzle ORM layer with Python/psycopg2.
 
 import os
 import json
+import zlib
 import logging
+import threading
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
+# Connections kept open between requests (see get_db)
+DB_POOL_MIN_CONN = 1
+DB_POOL_MAX_CONN = int(os.environ.get('DB_POOL_MAX_CONN', '20'))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Create the shared connection pool on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(DB_POOL_MIN_CONN, DB_POOL_MAX_CONN, DATABASE_URL)
+    return _pool
+
+
+def _connection_alive(conn) -> bool:
+    """Cheap round trip to catch a pooled connection the server has dropped."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
 
 @contextmanager
 def get_db():
-    """Get a database connection with automatic cleanup."""
+    """
+    Get a database connection with automatic cleanup.
+
+    Connections come from a shared pool so each call doesn't pay for a new
+    connect and auth. If every pooled connection is in use, a one-off
+    connection is opened (and closed afterwards) rather than failing.
+    Pooled connections are checked with SELECT 1 before use; ones the
+    server has dropped (restart, idle timeout) are closed and replaced.
+    """
     if not DATABASE_URL:
         raise RuntimeError("DATABASE_URL environment variable not set")
 
-    conn = psycopg2.connect(DATABASE_URL)
+    pool = _get_pool()
+    try:
+        conn = pool.getconn()
+        # After a server restart every idle connection may be dead; the
+        # pool opens a fresh one once no idle ones are left
+        for _ in range(DB_POOL_MAX_CONN):
+            if _connection_alive(conn):
+                break
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+    except PoolError:
+        logger.warning(f"Database pool exhausted ({DB_POOL_MAX_CONN} connections); opening a one-off connection")
+        pool = None
+        conn = psycopg2.connect(DATABASE_URL)
     try:
         yield conn
         conn.commit()
     except Exception:
-        conn.rollback()
+        if not conn.closed:
+            conn.rollback()
         raise
     finally:
-        conn.close()
+        if pool is None:
+            conn.close()
+        else:
+            pool.putconn(conn, close=bool(conn.closed))
+
+
+# Leading byte of game_saves.conversation_blob, identifying how it was packed
+CONVERSATION_CODEC_ZLIB = 1
+CONVERSATION_CODEC_ZSTD = 2
+ZSTD_LEVEL = 3
+
+
+def _dumps_json(data: Any) -> str:
+    """JSON text for a JSONB column (orjson when installed; JSONB normalizes formatting)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data)
+
+
+def _dumps_conversation(history: List[Dict[str, Any]]) -> bytes:
+    """JSON bytes of conversation_history, before compression."""
+    return orjson.dumps(history) if ORJSON_AVAILABLE else json.dumps(history).encode("utf-8")
+
+
+def _compress_conversation(raw: bytes) -> bytes:
+    """Compress serialized conversation_history, prefixed with its codec byte."""
+    if ZSTD_AVAILABLE:
+        body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+        return bytes([CONVERSATION_CODEC_ZSTD]) + body
+    return bytes([CONVERSATION_CODEC_ZLIB]) + zlib.compress(raw, 1)
+
+
+def _unpack_conversation(blob) -> List[Dict[str, Any]]:
+    """Decompress and parse a conversation_blob (inverse of _compress_conversation)."""
+    blob = bytes(blob)
+    codec, body = blob[0], blob[1:]
+    if codec == CONVERSATION_CODEC_ZSTD:
+        raw = zstandard.ZstdDecompressor().decompress(body)
+    elif codec == CONVERSATION_CODEC_ZLIB:
+        raw = zlib.decompress(body)
+    else:
+        raise ValueError(f"Unknown conversation codec: {codec}")
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _apply_state_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one delta save (see GameState.to_delta) onto a full save dict."""
+    state.update(delta.get("fields", {}))
+    base_lengths = delta.get("base_lengths", {})
+    for key, items in delta.get("appends", {}).items():
+        merged = state.get(key) or []
+        del merged[base_lengths.get(key, len(merged)):]
+        merged.extend(items)
+        state[key] = merged
+    return state
 
 
 class Storage:
@@ -79,35 +197,90 @@ class Storage:
     def save_game(self, user_id: str, game_id: str, player_name: Optional[str],
                   current_era: Optional[str], phase: Optional[str],
                   state: Dict[str, Any], started_at: Optional[datetime] = None) -> Dict[str, Any]:
-        """Save or update a game."""
+        """Save or update a game. conversation_history is stored compressed in its own column."""
+        return self.save_game_encoded(user_id, game_id, player_name, current_era, phase,
+                                      self.encode_game_state(state), started_at)
+
+    def encode_game_state(self, state: Dict[str, Any]) -> Tuple[str, Optional[bytes]]:
+        """
+        Serialize a save state for save_game_encoded: (state JSON without
+        conversation_history, conversation_history JSON or None).
+        Compression is left to the write.
+        """
+        state = dict(state)
+        history = state.pop("conversation_history", None)
+        conversation = None if history is None else _dumps_conversation(history)
+        return _dumps_json(state), conversation
+
+    def encode_delta(self, delta: Dict[str, Any]) -> str:
+        """Serialize a delta save (see GameState.to_delta) for save_game_delta_encoded."""
+        return _dumps_json(delta)
+
+    def save_game_encoded(self, user_id: str, game_id: str, player_name: Optional[str],
+                          current_era: Optional[str], phase: Optional[str],
+                          encoded: Tuple[str, Optional[bytes]],
+                          started_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """save_game with the state already serialized by encode_game_state."""
+        state_json, conversation = encoded
+        if conversation is not None:
+            conversation = _compress_conversation(conversation)
         with get_db() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Check if exists
-                cur.execute(
-                    "SELECT id FROM game_saves WHERE user_id = %s AND game_id = %s",
-                    (user_id, game_id)
-                )
-                existing = cur.fetchone()
-
-                if existing:
-                    cur.execute("""
-                        UPDATE game_saves
-                        SET state = %s, saved_at = NOW(), player_name = %s,
-                            current_era = %s, phase = %s
-                        WHERE user_id = %s AND game_id = %s
-                        RETURNING *
-                    """, (json.dumps(state), player_name, current_era, phase, user_id, game_id))
-                else:
+                # Update in place, clearing any deltas written since the last
+                # full save in the same statement (one round trip)
+                cur.execute("""
+                    WITH cleared AS (
+                        DELETE FROM game_state_deltas WHERE user_id = %s AND game_id = %s
+                    )
+                    UPDATE game_saves
+                    SET state = %s, conversation_blob = %s, saved_at = NOW(),
+                        player_name = %s, current_era = %s, phase = %s
+                    WHERE user_id = %s AND game_id = %s
+                    RETURNING id
+                """, (user_id, game_id, state_json, conversation, player_name, current_era, phase,
+                      user_id, game_id))
+
+                if cur.rowcount == 0:
                     cur.execute("""
-                        INSERT INTO game_saves (user_id, game_id, player_name, current_era, phase, state, started_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        RETURNING *
-                    """, (user_id, game_id, player_name, current_era, phase, json.dumps(state), started_at))
+                        INSERT INTO game_saves (user_id, game_id, player_name, current_era, phase,
+                                                state, conversation_blob, started_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                        RETURNING id
+                    """, (user_id, game_id, player_name, current_era, phase, state_json,
+                          conversation, started_at))
 
                 return dict(cur.fetchone())
 
+    def save_game_delta(self, user_id: str, game_id: str, turn_no: int,
+                        delta: Dict[str, Any], current_era: Optional[str],
+                        phase: Optional[str]) -> bool:
+        """Append a per-turn delta to an existing save. Returns False if there is no base save."""
+        return self.save_game_delta_encoded(user_id, game_id, turn_no, self.encode_delta(delta),
+                                            current_era, phase)
+
+    def save_game_delta_encoded(self, user_id: str, game_id: str, turn_no: int,
+                                delta_json: str, current_era: Optional[str],
+                                phase: Optional[str]) -> bool:
+        """save_game_delta with the delta already serialized by encode_delta."""
+        with get_db() as conn:
+            with conn.cursor() as cur:
+                # Touch the base save and append the delta in one statement;
+                # nothing is inserted when there is no base save
+                cur.execute("""
+                    WITH touched AS (
+                        UPDATE game_saves
+                        SET saved_at = NOW(), current_era = %s, phase = %s
+                        WHERE user_id = %s AND game_id = %s
+                        RETURNING 1
+                    )
+                    INSERT INTO game_state_deltas (user_id, game_id, turn_no, delta)
+                    SELECT %s, %s, %s, %s::jsonb
+                    WHERE EXISTS (SELECT 1 FROM touched)
+                """, (current_era, phase, user_id, game_id, user_id, game_id, turn_no, delta_json))
+                return cur.rowcount > 0
+
     def load_game(self, user_id: str, game_id: str) -> Optional[Dict[str, Any]]:
-        """Load a saved game."""
+        """Load a saved game, with any delta saves applied to its state."""
         with get_db() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
@@ -115,12 +288,36 @@ class Storage:
                     (user_id, game_id)
                 )
                 result = cur.fetchone()
-                return dict(result) if result else None
+                if not result:
+                    return None
+                result = dict(result)
+
+                cur.execute("""
+                    SELECT delta FROM game_state_deltas
+                    WHERE user_id = %s AND game_id = %s
+                    ORDER BY id
+                """, (user_id, game_id))
+                deltas = cur.fetchall()
+                conversation = result.pop("conversation_blob", None)
+                if deltas or conversation is not None:
+                    state = result.get("state")
+                    if isinstance(state, str):
+                        state = json.loads(state)
+                    if conversation is not None:
+                        state["conversation_history"] = _unpack_conversation(conversation)
+                    for row in deltas:
+                        _apply_state_delta(state, row["delta"])
+                    result["state"] = state
+                return result
 
     def delete_game(self, user_id: str, game_id: str) -> bool:
         """Delete a saved game."""
         with get_db() as conn:
             with conn.cursor() as cur:
+                cur.execute(
+                    "DELETE FROM game_state_deltas WHERE user_id = %s AND game_id = %s",
+                    (user_id, game_id)
+                )
                 cur.execute(
                     "DELETE FROM game_saves WHERE user_id = %s AND game_id = %s",
                     (user_id, game_id)
@@ -132,7 +329,11 @@ class Storage:
         with get_db() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
-                    "SELECT * FROM game_saves WHERE user_id = %s ORDER BY saved_at DESC",
+                    """
+                    SELECT id, user_id, game_id, player_name, current_era, phase,
+                           state, saved_at, started_at
+                    FROM game_saves WHERE user_id = %s ORDER BY saved_at DESC
+                    """,
                     (user_id,)
                 )
                 return [dict(row) for row in cur.fetchall()]
@@ -140,16 +341,25 @@ class Storage:
     # ==================== Leaderboard ====================
 
     def add_leaderboard_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
-        """Add a leaderboard entry."""
+        """
+        Add a leaderboard entry. The returned row also carries its 'rank'
+        (same as get_rank), computed in the same statement.
+        """
         with get_db() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
-                    INSERT INTO leaderboard_entries
-                    (user_id, game_id, player_name, turns_survived, eras_visited,
-                     belonging_score, legacy_score, freedom_score, total_score,
-                     ending_type, final_era, blurb, ending_narrative)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING *
+                    WITH inserted AS (
+                        INSERT INTO leaderboard_entries
+                        (user_id, game_id, player_name, turns_survived, eras_visited,
+                         belonging_score, legacy_score, freedom_score, total_score,
+                         ending_type, final_era, blurb, ending_narrative)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        RETURNING *
+                    )
+                    SELECT inserted.*,
+                           (SELECT COUNT(*) FROM leaderboard_entries l
+                            WHERE l.total_score > inserted.total_score) + 1 AS rank
+                    FROM inserted
                 """, (
                     entry['userId'], entry.get('gameId'), entry['playerName'],
                     entry.get('turnsSurvived', 0), entry.get('erasVisited', 0),
@@ -14,6 +14,9 @@ from db import storage
 class DatabaseSaveManager:
     """Manages saving and loading game states via direct database access"""
 
+    # Write a full save after this many consecutive delta saves
+    DELTA_COMPACT_EVERY = 10
+
     def __init__(self):
         pass
 
@@ -23,21 +26,124 @@ class DatabaseSaveManager:
         Returns True if successful.
         """
         try:
-            save_data = state.to_save_dict()
+            snapshot = self._encode_full(state)
+        except Exception as e:
+            print(f"Database save error: {e}")
+            return False
+        if not self._write_full(user_id, game_id, snapshot):
+            return False
+        state.mark_saved(full=True)
+        return True
+
+    def save_delta(self, user_id: str, game_id: str, state) -> bool:
+        """
+        Save only what changed since the last save (per-turn auto-save).
+        Falls back to a full save when no delta is possible or every
+        DELTA_COMPACT_EVERY deltas, so loads never replay a long chain.
+        Returns True if successful.
+        """
+        if state.deltas_since_full_save >= self.DELTA_COMPACT_EVERY:
+            return self.save_game(user_id, game_id, state)
+
+        delta = state.to_delta()
+        if delta is None:
+            return self.save_game(user_id, game_id, state)
+
+        try:
+            snapshot = self._encode_delta(state, delta)
+        except Exception as e:
+            print(f"Database delta save error: {e}")
+            return False
+        saved = self._write_delta(user_id, game_id, snapshot)
+        if saved is None:
+            return False
+        if not saved:
+            return self.save_game(user_id, game_id, state)
+        state.mark_saved(full=False)
+        return True
+
+    def snapshot_save(self, user_id: str, game_id: str, state, full: bool = False) -> Dict:
+        """
+        Serialize what a background auto-save will write (see save_snapshot).
+        Called on the thread that owns the state; the state is marked as
+        saved here, so after a failed write the next snapshot must be full.
+        Same delta/full choice as save_delta.
+        """
+        delta = None
+        if not full and state.deltas_since_full_save < self.DELTA_COMPACT_EVERY:
+            delta = state.to_delta()
+
+        if delta is None:
+            snapshot = self._encode_full(state)
+            state.mark_saved(full=True)
+        else:
+            snapshot = self._encode_delta(state, delta)
+            state.mark_saved(full=False)
+        return snapshot
+
+    def save_snapshot(self, user_id: str, game_id: str, snapshot: Dict) -> bool:
+        """
+        Write a snapshot_save() result. A delta with no base save to
+        apply to is not written.
+        Returns True if successful.
+        """
+        if "delta" in snapshot:
+            return bool(self._write_delta(user_id, game_id, snapshot))
+        return self._write_full(user_id, game_id, snapshot)
+
+    def _encode_full(self, state) -> Dict:
+        """Full save of state, serialized for _write_full"""
+        save_data = state.to_save_dict()
+        return {
+            "state": storage.encode_game_state(save_data),
+            "player_name": save_data.get("player_name"),
+            "phase": save_data.get("phase"),
+            "current_era": state.current_era.era_name if state.current_era else None,
+        }
 
-            storage.save_game(
+    def _encode_delta(self, state, delta: Dict) -> Dict:
+        """A to_delta() result, serialized for _write_delta"""
+        return {
+            "delta": storage.encode_delta(delta),
+            "turn_no": state.time_machine.total_turns,
+            "phase": delta["fields"].get("phase"),
+            "current_era": state.current_era.era_name if state.current_era else None,
+        }
+
+    def _write_full(self, user_id: str, game_id: str, snapshot: Dict) -> bool:
+        """Write an _encode_full() result. Returns True if successful."""
+        try:
+            storage.save_game_encoded(
                 user_id=user_id,
                 game_id=game_id,
-                player_name=save_data.get("player_name"),
-                current_era=state.current_era.era_name if state.current_era else None,
-                phase=save_data.get("phase"),
-                state=save_data,
+                player_name=snapshot["player_name"],
+                current_era=snapshot["current_era"],
+                phase=snapshot["phase"],
+                encoded=snapshot["state"],
             )
             return True
         except Exception as e:
             print(f"Database save error: {e}")
             return False
 
+    def _write_delta(self, user_id: str, game_id: str, snapshot: Dict) -> Optional[bool]:
+        """
+        Append an _encode_delta() result. Returns True if written, False
+        if there is no base save, None on error.
+        """
+        try:
+            return storage.save_game_delta_encoded(
+                user_id=user_id,
+                game_id=game_id,
+                turn_no=snapshot["turn_no"],
+                delta_json=snapshot["delta"],
+                current_era=snapshot["current_era"],
+                phase=snapshot["phase"],
+            )
+        except Exception as e:
+            print(f"Database delta save error: {e}")
+            return None
+
     def load_game(self, user_id: str, game_id: str):
         """
         Load game state from database.
@@ -120,8 +226,7 @@ class DatabaseLeaderboardStorage:
                 "blurb": score.get("blurb", ""),
                 "endingNarrative": score.get("ending_narrative", ""),
             }
-            storage.add_leaderboard_entry(entry)
-            return storage.get_rank(score.get("total", 0))
+            return storage.add_leaderboard_entry(entry)["rank"]
         except Exception as e:
             print(f"Add score error: {e}")
             return 1
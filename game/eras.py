@@ -2056,12 +2056,33 @@ aesthetic - no modern vehicles.""",
 ]
 
 
+# Lookup tables built once at import
+_ERA_BY_ID = {era['id']: era for era in ERAS}
+_WISDOM_BY_ERA_ID = {
+    era['id']: {path['id']: path for path in era.get('wisdom_paths', []) if 'id' in path}
+    for era in ERAS
+}
+
+
+def format_year(year):
+    """Display form of an era year, e.g. -1250 -> '1250 BCE'"""
+    return f"{abs(year)} BCE" if year < 0 else f"{year} CE"
+
+
+_YEAR_DISPLAY_BY_ERA_ID = {era['id']: format_year(era['year']) for era in ERAS}
+
+
 def get_era_by_id(era_id):
     """Get a specific era by ID"""
-    for era in ERAS:
-        if era['id'] == era_id:
-            return era
-    return None
+    return _ERA_BY_ID.get(era_id)
+
+
+def get_year_display(era):
+    """Display year for an era (precomputed for the static ERAS)"""
+    era_id = era.get('id')
+    if _ERA_BY_ID.get(era_id) is era:
+        return _YEAR_DISPLAY_BY_ERA_ID[era_id]
+    return format_year(era['year'])
 
 
 def get_random_era():
@@ -2123,6 +2144,11 @@ def get_wisdom_path_by_id(era, wisdom_id):
     Returns:
         Dict with 'id', 'insight', 'narrative_hook' if found, None otherwise.
     """
+    era_id = era.get('id')
+    if _ERA_BY_ID.get(era_id) is era:
+        return _WISDOM_BY_ERA_ID[era_id].get(wisdom_id)
+
+    # Era dict that isn't one of ERAS (e.g. edited copy) - scan it directly
     wisdom_paths = era.get('wisdom_paths', [])
     for path in wisdom_paths:
         if path.get('id') == wisdom_id:
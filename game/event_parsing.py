@@ -17,6 +17,22 @@ import re
 from typing import Dict, List, Optional, Tuple
 
 
+# Event tags and their contents; the tag name is group 1, so one scan
+# covers all of them (see parse_all_events)
+_EVENT_TAG_RE = re.compile(
+    r'<(character_name|key_npc|wisdom)>\s*([^<]+?)\s*</\1>',
+    re.IGNORECASE
+)
+_CHARACTER_NAME_RE = re.compile(r'<character_name>\s*([^<]+?)\s*</character_name>', re.IGNORECASE)
+_KEY_NPC_RE = re.compile(r'<key_npc>\s*([^<]+?)\s*</key_npc>', re.IGNORECASE)
+_WISDOM_RE = re.compile(r'<wisdom>\s*([^<]+?)\s*</wisdom>', re.IGNORECASE)
+_EVENT_TAG_STRIP_RES = tuple(
+    re.compile(r'<' + tag + r'>\s*[^<]*?\s*</' + tag + r'>', re.IGNORECASE)
+    for tag in ("character_name", "key_npc", "wisdom")
+)
+_EXTRA_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+
+
 # =============================================================================
 # PROMPT ADDITIONS - Instructions for AI to output event tags
 # =============================================================================
@@ -62,11 +78,7 @@ def parse_character_name(response: str) -> Optional[str]:
     
     Returns the name if found, None otherwise.
     """
-    match = re.search(
-        r'<character_name>\s*([^<]+?)\s*</character_name>',
-        response,
-        re.IGNORECASE
-    )
+    match = _CHARACTER_NAME_RE.search(response)
     if match:
         return match.group(1).strip()
     return None
@@ -78,11 +90,7 @@ def parse_key_npcs(response: str) -> List[str]:
     
     Returns a list of NPC names (may contain duplicates if mentioned multiple times).
     """
-    matches = re.findall(
-        r'<key_npc>\s*([^<]+?)\s*</key_npc>',
-        response,
-        re.IGNORECASE
-    )
+    matches = _KEY_NPC_RE.findall(response)
     return [name.strip() for name in matches if name.strip()]
 
 
@@ -92,11 +100,7 @@ def parse_wisdom_moment(response: str) -> Optional[str]:
     
     Returns the wisdom ID if found, None otherwise.
     """
-    match = re.search(
-        r'<wisdom>\s*([^<]+?)\s*</wisdom>',
-        response,
-        re.IGNORECASE
-    )
+    match = _WISDOM_RE.search(response)
     if match:
         return match.group(1).strip()
     return None
@@ -109,32 +113,12 @@ def strip_event_tags(response: str) -> str:
     Removes: <character_name>, <key_npc>, <wisdom> tags
     Note: Anchor tags are handled separately by strip_anchor_tags()
     """
-    # Remove character_name tags
-    response = re.sub(
-        r'<character_name>\s*[^<]*?\s*</character_name>',
-        '',
-        response,
-        flags=re.IGNORECASE
-    )
-    
-    # Remove key_npc tags
-    response = re.sub(
-        r'<key_npc>\s*[^<]*?\s*</key_npc>',
-        '',
-        response,
-        flags=re.IGNORECASE
-    )
-    
-    # Remove wisdom tags
-    response = re.sub(
-        r'<wisdom>\s*[^<]*?\s*</wisdom>',
-        '',
-        response,
-        flags=re.IGNORECASE
-    )
+    # One pass per tag, in order: removing one tag can complete another
+    for tag_re in _EVENT_TAG_STRIP_RES:
+        response = tag_re.sub('', response)
     
     # Clean up any extra whitespace left behind
-    response = re.sub(r'\n\s*\n\s*\n', '\n\n', response)
+    response = _EXTRA_BLANK_LINES_RE.sub('\n\n', response)
     
     return response.strip()
 
@@ -147,11 +131,30 @@ def parse_all_events(response: str) -> Dict:
     - character_name: str or None
     - key_npcs: List[str]
     - wisdom_id: str or None
+    
+    Same results as the individual parsers (first name, all NPCs, first
+    wisdom), but in a single pass over the response.
     """
+    character_name = None
+    key_npcs = []
+    wisdom_id = None
+    
+    for match in _EVENT_TAG_RE.finditer(response):
+        tag = match.group(1).lower()
+        value = match.group(2).strip()
+        if tag == "key_npc":
+            if value:
+                key_npcs.append(value)
+        elif tag == "character_name":
+            if character_name is None:
+                character_name = value
+        elif wisdom_id is None:
+            wisdom_id = value
+    
     return {
-        "character_name": parse_character_name(response),
-        "key_npcs": parse_key_npcs(response),
-        "wisdom_id": parse_wisdom_moment(response)
+        "character_name": character_name,
+        "key_npcs": key_npcs,
+        "wisdom_id": wisdom_id
     }
 
 
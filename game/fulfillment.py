@@ -11,6 +11,7 @@ detects anchor-relevant choices and the game tracks them internally.
 The player only experiences the narrative consequences.
 """
 
+import re
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
@@ -470,20 +471,22 @@ Most choices affect 1-2 anchors. Some affect none. Rarely do all three change.
 """
 
 
+# Parsed out of every narrator response
+_ANCHOR_ADJUSTMENTS_RE = re.compile(
+    r'<anchors>\s*belonging\[([+\-]?\d+)\]\s*legacy\[([+\-]?\d+)\]\s*freedom\[([+\-]?\d+)\]\s*</anchors>',
+    re.IGNORECASE
+)
+_ANCHORS_TAG_RE = re.compile(r'<anchors>.*?</anchors>', re.IGNORECASE | re.DOTALL)
+
+
 def parse_anchor_adjustments(response: str) -> Dict[str, int]:
     """
     Parse anchor adjustments from AI response.
     Returns dict of anchor_name -> delta
     """
-    import re
-    
     adjustments = {"belonging": 0, "legacy": 0, "freedom": 0}
     
-    match = re.search(
-        r'<anchors>\s*belonging\[([+\-]?\d+)\]\s*legacy\[([+\-]?\d+)\]\s*freedom\[([+\-]?\d+)\]\s*</anchors>',
-        response,
-        re.IGNORECASE
-    )
+    match = _ANCHOR_ADJUSTMENTS_RE.search(response)
     
     if match:
         adjustments["belonging"] = int(match.group(1))
@@ -495,5 +498,4 @@ def parse_anchor_adjustments(response: str) -> Dict[str, int]:
 
 def strip_anchor_tags(response: str) -> str:
     """Remove anchor tags from response before showing to player"""
-    import re
-    return re.sub(r'<anchors>.*?</anchors>', '', response, flags=re.IGNORECASE | re.DOTALL).strip()
+    return _ANCHORS_TAG_RE.sub('', response).strip()
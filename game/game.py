@@ -585,7 +585,7 @@ class Game:
             print(f"{Colors.DIM}{self.current_era['name']} | {self.state.current_era.time_in_era_description}{Colors.END}\n")
         
         # If window just opened, generate window-aware response instead of normal turn
-        if events["window_opened"]:
+        if events.window_opened:
             # Show window opened header
             print(f"{Colors.GREEN}{'═' * 50}{Colors.END}")
             print(f"{Colors.GREEN}  THE WINDOW IS OPEN{Colors.END}")
@@ -615,9 +615,9 @@ class Game:
         self._process_response(response)
         
         # Handle window state notifications (but NOT window_opened since we handled it above)
-        if events["window_closing"]:
+        if events.window_closing:
             print(f"\n{Colors.YELLOW}The device pulses urgently. The window is closing...{Colors.END}")
-        elif events["window_closed"]:
+        elif events.window_closed:
             print(f"\n{Colors.DIM}The device falls silent. The moment has passed.{Colors.END}")
             self.state.phase = GamePhase.LIVING
     
@@ -18,10 +18,18 @@ import json
 import random
 import re
 import os
+import time
+import sqlite3
 import logging
+import threading
+import functools
 from typing import Optional, Generator, Dict, Any, List
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
 from datetime import datetime
 from dataclasses import dataclass, asdict
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
@@ -32,29 +40,60 @@ try:
 except ImportError:
     ANTHROPIC_AVAILABLE = False
 
+# Try to import orjson (faster save serialization), fall back to json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import ijson (incremental parsing for save listings)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Try to import the portrait generator (ending portraits; also needs OPENAI_API_KEY)
+try:
+    import portrait_generator
+    PORTRAITS_AVAILABLE = portrait_generator.OPENAI_AVAILABLE
+except ImportError:
+    portrait_generator = None
+    PORTRAITS_AVAILABLE = False
+
 # Local imports
-from config import EUROPEAN_ERA_IDS, get_debug_era_id, NARRATIVE_MODEL, PREMIUM_MODEL
+from config import (
+    EUROPEAN_ERA_IDS, get_debug_era_id, NARRATIVE_MODEL, PREMIUM_MODEL, DEBUG_MODE,
+    SAVE_BACKEND, SQLITE_SAVE_PATH, STARTING_ITEMS
+)
 from game_state import GameState, GameMode, GamePhase, RegionPreference
 from time_machine import select_random_era, IndicatorState
 from fulfillment import parse_anchor_adjustments, strip_anchor_tags
 from items import parse_item_usage
 from event_parsing import (
-    parse_character_name, parse_key_npcs, parse_wisdom_moment,
-    strip_event_tags, check_defining_moment
+    parse_all_events, strip_event_tags, check_defining_moment
 )
-from eras import ERAS, get_era_by_id, get_wisdom_path_by_id
+from eras import ERAS, get_era_by_id, get_wisdom_path_by_id, get_year_display
 from prompts import (
-    get_system_prompt, get_arrival_prompt, get_turn_prompt,
+    get_active_template, get_system_prompt_parts, get_arrival_prompt, get_turn_prompt,
     get_window_prompt, get_staying_ending_prompt, get_leaving_prompt,
     get_historian_narrative_prompt, get_quit_ending_prompt
 )
-from scoring import calculate_score, Leaderboard, AoAEntry, AnnalsOfAnachron
+from scoring import calculate_score, Leaderboard, AoAEntry, AnnalsOfAnachron, AOA_THRESHOLDS
 from db_storage import DatabaseSaveManager, DatabaseLeaderboardStorage, DatabaseGameHistory
 from choice_intent import (
     ChoiceIntent, detect_choice_intent, filter_choices, 
     get_choice_intent_for_submission
 )
 
+# Era pools by region, built once (eras are static)
+WORLDWIDE_ERAS = tuple(ERAS)
+EUROPEAN_ERAS = tuple(e for e in ERAS if e['id'] in EUROPEAN_ERA_IDS)
+
+# Era forced by DEBUG_MODE + DEBUG_ERA (None normally); config is read once at startup
+DEBUG_ERA = get_era_by_id(get_debug_era_id())
+
 
 # =============================================================================
 # MESSAGE TYPES
@@ -93,6 +132,7 @@ class MessageType:
     STAYING_FOREVER = "staying_forever"
     ENDING_NARRATIVE = "ending_narrative"
     FINAL_SCORE = "final_score"
+    PORTRAIT_READY = "portrait_ready"  # AoA portrait that finished after the score
     
     # System
     WAITING_INPUT = "waiting_input"
@@ -120,10 +160,213 @@ def emit(msg_type: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
     }
 
 
+# Streaming chunks are emitted per token, so their timestamp is refreshed
+# at most once per second instead of formatting datetime.now() every time.
+_chunk_ts = ""
+_chunk_ts_at = 0.0
+
+
+def emit_chunk(text: str) -> Dict[str, Any]:
+    """Create a NARRATIVE_CHUNK message (hot path for streaming)"""
+    global _chunk_ts, _chunk_ts_at
+    now = time.monotonic()
+    if now - _chunk_ts_at >= 1.0 or not _chunk_ts:
+        _chunk_ts = datetime.now().isoformat()
+        _chunk_ts_at = now
+    return {"type": MessageType.NARRATIVE_CHUNK, "data": {"text": text}, "timestamp": _chunk_ts}
+
+
+def _make_emitter(msg_type: str):
+    """Build an emit() specialized for one message type that always has data"""
+    def emitter(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"type": msg_type, "data": data, "timestamp": datetime.now().isoformat()}
+    emitter.__name__ = f"emit_{msg_type}"
+    emitter.__doc__ = f"Create a {msg_type} message"
+    return emitter
+
+
+# Specialized emitters for the message types sent every turn
+emit_choices = _make_emitter(MessageType.CHOICES)
+emit_loading = _make_emitter(MessageType.LOADING)
+emit_waiting_input = _make_emitter(MessageType.WAITING_INPUT)
+emit_device_status = _make_emitter(MessageType.DEVICE_STATUS)
+
+# Fixed payloads for messages sent every turn / era change. Shared between
+# messages rather than rebuilt each time - callers must not mutate them.
+LOADING_STORY = {"message": "The story unfolds..."}
+LOADING_ARRIVING = {"message": "Arriving..."}
+LOADING_REALITY_SHIFTS = {"message": "Reality shifts..."}
+WINDOW_CLOSING_DATA = {"message": "The device pulses urgently. The window is closing..."}
+WINDOW_CLOSED_DATA = {"message": "The device falls silent. The moment has passed."}
+DEPARTURE_DATA = {"title": "DEPARTURE", "message": "You activate the time machine..."}
+WAIT_NEXT_ERA = {"action": "continue_to_next_era"}
+
+# Intro payload for each starting item (a new game's items are always unused)
+INTRO_ITEM_DATA = {
+    item["id"]: {
+        "id": item["id"],
+        "name": item["name"],
+        "description": item["description"],
+        "uses": item.get("uses"),
+        "utility": item["utility"],
+        "risk": item["risk"]
+    }
+    for item in STARTING_ITEMS
+}
+
+
+# =============================================================================
+# DEMO RESPONSES (used when the API is unavailable)
+# =============================================================================
+
+_DEMO_STAY_RE = re.compile(r'stay permanently|chosen to stay|staying ending', re.IGNORECASE)
+_DEMO_QUIT_RE = re.compile(r'historical context', re.IGNORECASE)
+_DEMO_ARRIVAL_RE = re.compile(r'arrival', re.IGNORECASE)
+
+DEMO_STAY_RESPONSE = """The decision settles over you like the first warmth of spring after a long winter. This is where you belong now.
+
+You look around at the familiar streets, the faces you've come to know, the life you've built here piece by piece. The device on your wrist feels lighter somehow, as if it too understands that your journey has found its destination.
+
+Years pass. You build a home, not just of walls and roof, but of memories and relationships. The people here become your people. Your strange knowledge from another time becomes local wisdom, passed down to those who need it.
+
+When you grow old, you sit by the fire and sometimes think of the world you left behind. But there is no regret. You found what you were searching for—not a time, but a place where you truly belonged.
+
+The traveler's journey ends not with a return, but with an arrival."""
+
+DEMO_QUIT_RESPONSE = """Some journeys end before the destination is found. You set down the device, its glow fading to nothing.
+
+The weight of all the eras you've passed through settles on your shoulders. You carry fragments of each—memories of faces, echoes of choices made and unmade.
+
+Perhaps another traveler will find the path you couldn't. Perhaps the device will call to someone else, someone who will find what you were seeking.
+
+Your story here is over, but stories have a way of continuing in unexpected ways."""
+
+DEMO_ARRIVAL_RESPONSE = """You stumble forward, catching yourself against rough stone. The air hits you first—woodsmoke, animal dung, something cooking. Your ears ring from the transition.
+
+When your vision clears, you see a narrow street of packed earth. Wooden buildings lean against each other, their upper floors jutting out. People in rough wool and leather stop to stare at your strange clothing.
+
+A woman carrying a basket of bread crosses herself and hurries past. A dog barks. Somewhere nearby, a hammer rings against metal.
+
+You are Thomas the Stranger now—that's what they'll call you. Your device hangs cool against your chest, dormant. Your three items are hidden beneath your coat. You need shelter before dark, and you need to figure out when and where you are.
+
+A tavern sign creaks in the wind ahead. To your left, a church bell tower rises above the rooftops. To your right, a blacksmith's forge glows orange through an open door.
+
+[A] Head to the tavern - travelers gather there, and you need information
+[B] Make for the church - sanctuary and perhaps a sympathetic ear
+[C] Approach the blacksmith - honest work might earn trust faster than questions
+
+<anchors>belonging[0] legacy[0] freedom[0]</anchors>"""
+
+DEMO_TURN_RESPONSE = """Your choice sets events in motion. The day unfolds with unexpected consequences.
+
+People are beginning to know your face now. Some nod in recognition. Others still eye you with suspicion. This place is becoming familiar, for better or worse.
+
+[A] Press forward with your current path
+[B] Seek out someone you've met before
+[C] Take time to observe and plan
+
+<anchors>belonging[+3] legacy[+1] freedom[+2]</anchors>"""
+
+
 # =============================================================================
 # NARRATIVE ENGINE (JSON-based)
 # =============================================================================
 
+# Tags the AI uses for metadata that should be hidden from the player
+HIDDEN_TAG_NAMES = ('anchors', 'character_name', 'key_npc', 'wisdom')
+
+# First character after '<' (or '</') -> the only hidden tag it can start
+# (tag names have distinct first letters). Lets the tokenizer reject an
+# ordinary '<' with one dict lookup.
+_HIDDEN_FIRST = {name[0]: f'<{name}>' for name in HIDDEN_TAG_NAMES}
+_HIDDEN_CLOSE_FIRST = {name[0]: f'</{name}>' for name in HIDDEN_TAG_NAMES}
+
+# Streaming tokenizer states
+STREAM_OUTSIDE = 0
+STREAM_INSIDE_HIDDEN = 1
+
+# Narrative chunks are coalesced before being yielded to the frontend:
+# flush once this many characters are pending or this many seconds passed
+FLUSH_CHARS = 64
+FLUSH_INTERVAL = 0.05
+
+
+# Rendered system prompts keyed by (era id, state fingerprint, template).
+# Reloads and resumes re-enter the same era with unchanged state.
+SYSTEM_PROMPT_CACHE_SIZE = 128
+_system_prompt_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _build_system_prompt(game_state: GameState, era: dict) -> tuple:
+    """
+    Render the system prompt as (static_prefix, dynamic_suffix), reusing a
+    cached copy when nothing relevant changed
+    """
+    key = (era['id'], game_state.fingerprint(), get_active_template("system"))
+    parts = _system_prompt_cache.get(key)
+    if parts is not None:
+        _system_prompt_cache.move_to_end(key)
+        return parts
+
+    parts = get_system_prompt_parts(game_state, era)
+    _system_prompt_cache[key] = parts
+    if len(_system_prompt_cache) > SYSTEM_PROMPT_CACHE_SIZE:
+        _system_prompt_cache.popitem(last=False)
+    return parts
+
+
+# Only the most recent messages are sent to the API; older turns in the era
+# are folded into a short summary that rides along in the system prompt.
+# Turns are only dropped once a summary covering them has been stored.
+MAX_HISTORY_MSGS = 30
+SUMMARIZE_EVERY = 6  # Evicted messages between summary refreshes
+
+HISTORY_SUMMARY_PROMPT = """Summarize the earlier part of this time-travel story for the narrator who will continue it.
+Keep names, relationships, promises, debts, injuries, items used and anything the player built or lost.
+Plain prose, under 250 words, no choices or tags.
+
+"""
+
+
+# One Anthropic client per process so every session shares its connection pool
+_SHARED_CLIENT = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def _get_anthropic_client():
+    """Lazily create the process-wide Anthropic client"""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _SHARED_CLIENT_LOCK:
+            if _SHARED_CLIENT is None:
+                import httpx  # installed with anthropic
+                _SHARED_CLIENT = anthropic.Anthropic(
+                    max_retries=2,
+                    timeout=httpx.Timeout(600.0, connect=10.0),
+                    http_client=anthropic.DefaultHttpxClient(
+                        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+                    ),
+                )
+    return _SHARED_CLIENT
+
+
+def _with_cache_breakpoint(messages: List[Dict]) -> List[Dict]:
+    """
+    Copy of messages whose last entry carries an ephemeral cache_control.
+    The stored messages are never modified (they are the saved history).
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
+    else:
+        blocks = list(content)
+        blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+    return messages[:-1] + [{**last, "content": blocks}]
+
+
 class NarrativeEngine:
     """Handles AI-generated narrative with JSON output"""
     
@@ -131,24 +374,134 @@ class NarrativeEngine:
         self.game_state = game_state
         self.messages = []
         self.system_prompt = ""
+        self.system_prompt_static = ""
+        self._stream_state = STREAM_OUTSIDE
+        self._pending = ""
+        self.memory_summary = ""
+        self._summarized_upto = 0
+        self._summary_thread = None
+        self._memory_epoch = 0
         
-        if ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic()
-        else:
-            self.client = None
+        self.client = _get_anthropic_client() if ANTHROPIC_AVAILABLE else None
     
     def set_era(self, era: dict):
         """Set up system prompt for current era"""
-        self.system_prompt = get_system_prompt(self.game_state, era)
+        static_prefix, dynamic_suffix = _build_system_prompt(self.game_state, era)
+        self.system_prompt_static = static_prefix
+        self.system_prompt = static_prefix + dynamic_suffix
         self.messages = []
+        self.game_state.conversation_history = self.messages
+        self._reset_memory()
     
-    def restore_conversation(self, messages: List[Dict]):
-        """Restore conversation history from saved state"""
+    def _system_blocks(self) -> List[Dict]:
+        """
+        System prompt as content blocks with the era-static prefix marked for
+        prompt caching. Falls back to caching the whole prompt when it was
+        replaced externally (e.g. a Narrative Lab override).
+        """
+        if not self.system_prompt:
+            return []
+        static = self.system_prompt_static
+        if static and self.system_prompt.startswith(static):
+            blocks = [{"type": "text", "text": static, "cache_control": {"type": "ephemeral"}}]
+            dynamic = self.system_prompt[len(static):]
+            if dynamic:
+                blocks.append({"type": "text", "text": dynamic})
+        else:
+            blocks = [{"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}]
+        if self.memory_summary:
+            blocks.append({"type": "text", "text": f"\n\nSTORY SO FAR (earlier turns in this era):\n{self.memory_summary}"})
+        return blocks
+    
+    def _reset_memory(self):
+        """Forget the summary of evicted turns"""
+        self.memory_summary = ""
+        self._summarized_upto = 0
+        self._memory_epoch += 1
+    
+    def _api_messages(self) -> List[Dict]:
+        """
+        Messages to send to the API: the last MAX_HISTORY_MSGS, starting on a
+        user turn. Kicks off a background summary of anything older; until
+        that summary is stored, the older messages are still sent.
+        
+        The newest message is marked as a prompt-cache breakpoint, so the next
+        call (a turn, leaving, staying or quitting) reads the whole conversation
+        up to its own prompt from cache instead of only the system prompt.
+        
+        Call before _system_blocks: _summarize stores the summary before
+        its end index, so the window read here never skips past it.
+        """
+        start = max(0, len(self.messages) - MAX_HISTORY_MSGS)
+        if start and self.messages[start].get("role") != "user":
+            start += 1
+        if start:
+            self._maybe_summarize(start)
+            start = min(start, self._summarized_upto)
+        return _with_cache_breakpoint(self.messages[start:])
+    
+    def _maybe_summarize(self, upto: int):
+        """Summarize messages[:upto] in the background if enough were evicted"""
+        if not self.client or upto <= self._summarized_upto:
+            return
+        if self._summarized_upto and upto - self._summarized_upto < SUMMARIZE_EVERY:
+            return
+        if self._summary_thread and self._summary_thread.is_alive():
+            return
+        self._summary_thread = threading.Thread(
+            target=self._summarize, args=(self.messages[:upto], upto, self._memory_epoch), daemon=True
+        )
+        self._summary_thread.start()
+    
+    def _summarize(self, evicted: List[Dict], upto: int, epoch: int):
+        """
+        Replace the memory summary with one covering the evicted messages.
+        On failure the old summary stays and the evicted messages keep being
+        sent; the next eviction retries.
+        """
+        transcript = "\n\n".join(f"{m.get('role', '').upper()}: {m.get('content', '')}" for m in evicted)
+        try:
+            response = self.client.messages.create(
+                model=NARRATIVE_MODEL,
+                max_tokens=600,
+                messages=[{"role": "user", "content": HISTORY_SUMMARY_PROMPT + transcript}]
+            )
+            if epoch != self._memory_epoch:
+                return  # Conversation was reset while summarizing
+            self.memory_summary = response.content[0].text
+            self._summarized_upto = upto
+        except Exception as e:
+            logger.error(f"History summary of {upto} messages failed (they stay in the window): {e}")
+    
+    def restore_conversation(self, messages: List[Dict], memory: Dict = None):
+        """
+        Restore conversation history from saved state. The saved list is
+        adopted as-is; passing the saved memory state (get_memory_state)
+        avoids re-summarizing every evicted turn on the next API call.
+        """
         self.messages = messages
+        self.game_state.conversation_history = messages
+        self._reset_memory()
+        if memory and 0 < memory.get("upto", 0) <= len(messages):
+            self.memory_summary = memory.get("summary", "")
+            self._summarized_upto = memory["upto"]
+    
+    def get_memory_state(self) -> Dict:
+        """Summary of evicted turns, for saving alongside the conversation"""
+        if not self.memory_summary:
+            return {}
+        return {"summary": self.memory_summary, "upto": self._summarized_upto}
     
     def get_conversation_history(self) -> List[Dict]:
-        """Get current conversation history for saving"""
-        return self.messages.copy()
+        """
+        Get current conversation history for saving.
+        
+        Returns the live, append-only message list rather than a copy; it is
+        the same list as game_state.conversation_history (bound in set_era
+        and restore_conversation), so delta saves only write the new tail.
+        Callers must treat it as read-only.
+        """
+        return self.messages
     
     def generate_streaming(self, user_prompt: str, model: str = None, temperature: float = None) -> Generator[Dict, None, str]:
         """
@@ -168,7 +521,7 @@ class NarrativeEngine:
             words = response.split(' ')
             for i, word in enumerate(words):
                 chunk = word + (' ' if i < len(words) - 1 else '')
-                yield emit(MessageType.NARRATIVE_CHUNK, {"text": chunk})
+                yield emit_chunk(chunk)
         else:
             response = yield from self._api_call_streaming(model=model or NARRATIVE_MODEL, temperature=temperature)
 
@@ -192,73 +545,134 @@ class NarrativeEngine:
         self.messages.append({"role": "assistant", "content": response})
         return response
     
+    def _reset_stream_filter(self):
+        """Reset the hidden-tag tokenizer before a new streaming response"""
+        self._stream_state = STREAM_OUTSIDE
+        self._pending = ""
+
+    def _filter_stream_text(self, text: str) -> str:
+        """
+        Feed a streamed delta through the hidden-tag tokenizer.
+
+        Single pass over the new text: jumps between '<' candidates with
+        str.find, flips state on known open/close tags and only retains the
+        few trailing characters that could still turn into a tag.
+        Returns the text that is safe to show the player.
+        """
+        data = self._pending + text
+        self._pending = ""
+        n = len(data)
+        i = 0
+        out = []
+
+        while i < n:
+            if self._stream_state == STREAM_OUTSIDE:
+                j = data.find('<', i)
+                if j == -1:
+                    out.append(data[i:])
+                    break
+                if j > i:
+                    out.append(data[i:j])
+                if j + 1 == n:
+                    # Lone '<' at the end - wait for the next character
+                    self._pending = '<'
+                    break
+                tag = _HIDDEN_FIRST.get(data[j + 1])
+                if tag is None:
+                    out.append('<')
+                    i = j + 1
+                elif data.startswith(tag, j):
+                    self._stream_state = STREAM_INSIDE_HIDDEN
+                    i = j + len(tag)
+                elif n - j < len(tag) and tag.startswith(data[j:]):
+                    # Could still become a hidden tag - wait for more text
+                    self._pending = data[j:]
+                    break
+                else:
+                    out.append('<')
+                    i = j + 1
+            else:
+                k = data.find('</', i)
+                if k == -1:
+                    # Hidden content is dropped; keep a lone trailing '<'
+                    if data[-1] == '<':
+                        self._pending = '<'
+                    break
+                if k + 2 == n:
+                    self._pending = '</'
+                    break
+                tag = _HIDDEN_CLOSE_FIRST.get(data[k + 2])
+                if tag is None:
+                    i = k + 2
+                elif data.startswith(tag, k):
+                    self._stream_state = STREAM_OUTSIDE
+                    i = k + len(tag)
+                elif n - k < len(tag) and tag.startswith(data[k:]):
+                    self._pending = data[k:]
+                    break
+                else:
+                    i = k + 2
+
+        return ''.join(out)
+
+    def _flush_stream_filter(self) -> str:
+        """Return any held-back text once the stream has finished"""
+        pending = self._pending
+        self._pending = ""
+        if self._stream_state == STREAM_OUTSIDE:
+            return pending
+        # Unterminated hidden tag - never show it
+        return ""
+
     def _api_call_streaming(self, model: str = NARRATIVE_MODEL, temperature: float = None) -> Generator[Dict, None, str]:
-        """Make streaming API call, yield chunks, return full response"""
-        response = ""
-        buffer = ""
-        in_hidden_tag = False
+        """
+        Make streaming API call, yield chunks, return full response.
 
-        # Tags that should be hidden from the player
-        hidden_tag_patterns = ['<anchors>', '<character_name>', '<key_npc>', '<wisdom>']
+        Uses the synchronous client on purpose: the server runs under gevent
+        with monkey-patched sockets, so waiting on the network here already
+        yields to other greenlets. An asyncio client would need its own event
+        loop and would not cooperate with the gevent hub.
+        """
+        response_parts = []
+        self._reset_stream_filter()
 
         try:
             stream_kwargs = dict(
                 model=model,
                 max_tokens=1500,
-                system=self.system_prompt,
-                messages=self.messages,
+                messages=self._api_messages(),
+                system=self._system_blocks(),
             )
             if temperature is not None:
                 stream_kwargs["temperature"] = temperature
 
+            pending_out = []
+            pending_len = 0
+            last_flush = time.monotonic()
+
             with self.client.messages.stream(**stream_kwargs) as api_stream:
                 for text in api_stream.text_stream:
-                    response += text
-                    buffer += text
-                    
-                    # Check for any hidden tag opening
-                    for tag_start in hidden_tag_patterns:
-                        if tag_start in buffer and not in_hidden_tag:
-                            before_tag = buffer.split(tag_start)[0]
-                            if before_tag:
-                                yield emit(MessageType.NARRATIVE_CHUNK, {"text": before_tag})
-                            buffer = tag_start + buffer.split(tag_start, 1)[1]
-                            in_hidden_tag = True
-                            break
-                    
-                    # Check for tag closing
-                    if in_hidden_tag:
-                        # Check for any closing tag
-                        closing_tags = ['</anchors>', '</character_name>', '</key_npc>', '</wisdom>']
-                        for close_tag in closing_tags:
-                            if close_tag in buffer:
-                                after_tag = buffer.split(close_tag, 1)[1] if close_tag in buffer else ''
-                                buffer = after_tag
-                                in_hidden_tag = False
-                                break
-                    
-                    # Emit non-tag content
-                    if not in_hidden_tag and '<' not in buffer:
-                        if buffer:
-                            yield emit(MessageType.NARRATIVE_CHUNK, {"text": buffer})
-                        buffer = ""
-                    elif not in_hidden_tag and '<' in buffer and '>' in buffer:
-                        # Check if this is a hidden tag
-                        is_hidden = any(tag in buffer for tag in hidden_tag_patterns)
-                        if not is_hidden:
-                            yield emit(MessageType.NARRATIVE_CHUNK, {"text": buffer})
-                            buffer = ""
-            
-            # Emit remaining buffer after cleaning all hidden tags
-            if buffer and not in_hidden_tag:
-                clean_buffer = buffer
-                clean_buffer = re.sub(r'<anchors>.*?</anchors>', '', clean_buffer, flags=re.DOTALL)
-                clean_buffer = re.sub(r'<character_name>.*?</character_name>', '', clean_buffer, flags=re.DOTALL | re.IGNORECASE)
-                clean_buffer = re.sub(r'<key_npc>.*?</key_npc>', '', clean_buffer, flags=re.DOTALL | re.IGNORECASE)
-                clean_buffer = re.sub(r'<wisdom>.*?</wisdom>', '', clean_buffer, flags=re.DOTALL | re.IGNORECASE)
-                if clean_buffer.strip():
-                    yield emit(MessageType.NARRATIVE_CHUNK, {"text": clean_buffer})
-                    
+                    response_parts.append(text)
+                    safe_text = self._filter_stream_text(text)
+                    if not safe_text:
+                        continue
+                    pending_out.append(safe_text)
+                    pending_len += len(safe_text)
+                    now = time.monotonic()
+                    if pending_len >= FLUSH_CHARS or now - last_flush > FLUSH_INTERVAL:
+                        yield emit_chunk(''.join(pending_out))
+                        pending_out = []
+                        pending_len = 0
+                        last_flush = now
+
+            # Emit any trailing text held back as a possible tag start
+            pending_out.append(self._flush_stream_filter())
+            remainder = ''.join(pending_out)
+            if remainder:
+                yield emit_chunk(remainder)
+
+            response = ''.join(response_parts)
+
         except Exception as e:
             yield emit(MessageType.ERROR, {"message": str(e)})
             response = self._demo_response("")
@@ -271,8 +685,8 @@ class NarrativeEngine:
             response = self.client.messages.create(
                 model=model,
                 max_tokens=1500,
-                system=self.system_prompt,
-                messages=self.messages
+                messages=self._api_messages(),
+                system=self._system_blocks()
             )
             return response.content[0].text
         except Exception as e:
@@ -280,63 +694,87 @@ class NarrativeEngine:
     
     def _demo_response(self, prompt: str) -> str:
         """Demo response when API unavailable"""
-        prompt_lower = prompt.lower()
-
         # Check for ending prompts (stay forever or quit)
-        if "stay permanently" in prompt_lower or "chosen to stay" in prompt_lower or "staying ending" in prompt_lower:
-            return """The decision settles over you like the first warmth of spring after a long winter. This is where you belong now.
-
-You look around at the familiar streets, the faces you've come to know, the life you've built here piece by piece. The device on your wrist feels lighter somehow, as if it too understands that your journey has found its destination.
-
-Years pass. You build a home, not just of walls and roof, but of memories and relationships. The people here become your people. Your strange knowledge from another time becomes local wisdom, passed down to those who need it.
-
-When you grow old, you sit by the fire and sometimes think of the world you left behind. But there is no regret. You found what you were searching for—not a time, but a place where you truly belonged.
-
-The traveler's journey ends not with a return, but with an arrival."""
+        if _DEMO_STAY_RE.search(prompt):
+            return DEMO_STAY_RESPONSE
 
         # Check for quit/abandon prompts (historical context prompt)
-        if "historical context" in prompt_lower:
-            return """Some journeys end before the destination is found. You set down the device, its glow fading to nothing.
+        if _DEMO_QUIT_RE.search(prompt):
+            return DEMO_QUIT_RESPONSE
 
-The weight of all the eras you've passed through settles on your shoulders. You carry fragments of each—memories of faces, echoes of choices made and unmade.
+        # Arrival prompt
+        if len(self.messages) <= 2 or _DEMO_ARRIVAL_RE.search(prompt):
+            return DEMO_ARRIVAL_RESPONSE
 
-Perhaps another traveler will find the path you couldn't. Perhaps the device will call to someone else, someone who will find what you were seeking.
+        # Default: regular gameplay turn
+        return DEMO_TURN_RESPONSE
 
-Your story here is over, but stories have a way of continuing in unexpected ways."""
 
-        # Arrival prompt
-        if "arrival" in prompt_lower or len(self.messages) <= 2:
-            return """You stumble forward, catching yourself against rough stone. The air hits you first—woodsmoke, animal dung, something cooking. Your ears ring from the transition.
-
-When your vision clears, you see a narrow street of packed earth. Wooden buildings lean against each other, their upper floors jutting out. People in rough wool and leather stop to stare at your strange clothing.
+# =============================================================================
+# GAME SAVE/LOAD MANAGER
+# =============================================================================
 
-A woman carrying a basket of bread crosses herself and hurries past. A dog barks. Somewhere nearby, a hammer rings against metal.
+def _dump_json_bytes(data: Any) -> bytes:
+    """Serialize save data to UTF-8 JSON (pretty-printed only in debug mode)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if DEBUG_MODE else 0)
+    if DEBUG_MODE:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
-You are Thomas the Stranger now—that's what they'll call you. Your device hangs cool against your chest, dormant. Your three items are hidden beneath your coat. You need shelter before dark, and you need to figure out when and where you are.
 
-A tavern sign creaks in the wind ahead. To your left, a church bell tower rises above the rooftops. To your right, a blacksmith's forge glows orange through an open door.
+def _load_json_bytes(raw: bytes) -> Any:
+    """Parse UTF-8 JSON written by _dump_json_bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
-[A] Head to the tavern - travelers gather there, and you need information
-[B] Make for the church - sanctuary and perhaps a sympathetic ear
-[C] Approach the blacksmith - honest work might earn trust faster than questions
 
-<anchors>belonging[0] legacy[0] freedom[0]</anchors>"""
+def _write_tmp(path: str, data: bytes) -> str:
+    """
+    Write data to a temp file next to path and fsync it. Returns temp path.
+    The name is unique per thread, so concurrent writers of one path
+    (e.g. a user's index) never share a temp file.
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def _atomic_write(path: str, data: bytes):
+    """Replace path with data so readers never see a half-written file"""
+    tmp_path = _write_tmp(path, data)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
-        # Default: regular gameplay turn
-        return """Your choice sets events in motion. The day unfolds with unexpected consequences.
 
-People are beginning to know your face now. Some nod in recognition. Others still eye you with suspicion. This place is becoming familiar, for better or worse.
+# Below this many saves, rebuilding an index reads files on the calling thread
+INDEX_REBUILD_POOL_MIN = 4
 
-[A] Press forward with your current path
-[B] Seek out someone you've met before
-[C] Take time to observe and plan
+# One lock per save index file, shared by every GameSaveManager in the
+# process (the background auto-save and a session's own saves can both
+# update the same user's index)
+_INDEX_LOCKS: Dict[str, threading.RLock] = {}
+_INDEX_LOCKS_GUARD = threading.Lock()
 
-<anchors>belonging[+3] legacy[+1] freedom[+2]</anchors>"""
 
+def _index_lock(index_path: str) -> threading.RLock:
+    """Lock guarding read-modify-write of one save index file"""
+    with _INDEX_LOCKS_GUARD:
+        lock = _INDEX_LOCKS.get(index_path)
+        if lock is None:
+            lock = _INDEX_LOCKS[index_path] = threading.RLock()
+        return lock
 
-# =============================================================================
-# GAME SAVE/LOAD MANAGER
-# =============================================================================
 
 class GameSaveManager:
     """Manages saving and loading game states"""
@@ -361,24 +799,186 @@ class GameSaveManager:
         """Get directory for user's saves"""
         return os.path.join(self.save_dir, user_id)
     
+    def _get_index_path(self, user_id: str) -> str:
+        """Get path for a user's save index (metadata of all their saves)"""
+        return os.path.join(self.save_dir, f"{user_id}.index.json")
+    
+    @staticmethod
+    def _extract_meta(save_data: Dict) -> Dict:
+        """Extract the listing metadata from a full (or partial) save"""
+        current_era = save_data.get("current_era")
+        if current_era:
+            try:
+                era_name = current_era["era_name"]
+            except (KeyError, TypeError):
+                era_name = "Unknown"
+        else:
+            era_name = None
+        
+        try:
+            total_turns = save_data["time_machine"]["total_turns"]
+        except (KeyError, TypeError):
+            total_turns = 0
+        
+        get = save_data.get
+        return {
+            "game_id": get("game_id", ""),
+            "player_name": get("player_name", "Unknown"),
+            "phase": get("phase", "unknown"),
+            "current_era": era_name,
+            "total_turns": total_turns,
+            "saved_at": get("saved_at", ""),
+            "started_at": get("started_at", "")
+        }
+    
+    # Save-file keys needed for a listing (all precede the large
+    # conversation_history / game_events arrays in to_save_dict order)
+    _META_PREFIXES = (
+        'saved_at', 'player_name', 'phase', 'started_at',
+        'current_era.era_name', 'time_machine.total_turns',
+    )
+    
+    def _read_save_meta(self, filepath: str, game_id: str) -> Dict:
+        """
+        Read just enough of a save file to list it.
+        With ijson, parsing stops once the metadata keys have been seen.
+        """
+        if not IJSON_AVAILABLE:
+            with open(filepath, 'rb') as f:
+                save_data = _load_json_bytes(f.read())
+            save_data.setdefault("game_id", game_id)
+            return self._extract_meta(save_data)
+        
+        found = {}
+        with open(filepath, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == 'current_era' and event == 'null':
+                    found['current_era.era_name'] = None
+                elif prefix in self._META_PREFIXES and event not in ('start_map', 'end_map', 'start_array', 'end_array', 'map_key'):
+                    found[prefix] = value
+                if len(found) == len(self._META_PREFIXES):
+                    break
+        
+        save_data = {k: found[k] for k in ('saved_at', 'player_name', 'phase', 'started_at') if k in found}
+        save_data["game_id"] = game_id
+        if 'current_era.era_name' in found and found['current_era.era_name'] is not None:
+            save_data["current_era"] = {"era_name": found['current_era.era_name']}
+        if 'time_machine.total_turns' in found:
+            save_data["time_machine"] = {"total_turns": found['time_machine.total_turns']}
+        return self._extract_meta(save_data)
+    
+    def _load_index(self, user_id: str) -> Optional[Dict[str, Dict]]:
+        """Load a user's save index. Returns None if missing or unreadable."""
+        try:
+            with open(self._get_index_path(user_id), 'rb') as f:
+                index = _load_json_bytes(f.read())
+            return index if isinstance(index, dict) else None
+        except (OSError, ValueError):
+            return None
+    
+    def _write_index(self, user_id: str, index: Dict[str, Dict]):
+        """Write a user's save index"""
+        _atomic_write(self._get_index_path(user_id), _dump_json_bytes(index))
+    
+    def _update_index(self, user_id: str, game_id: str, entry: Optional[Dict]):
+        """Add/replace (entry) or remove (None) one game in the user's index"""
+        try:
+            with _index_lock(self._get_index_path(user_id)):
+                index = self._load_index(user_id)
+                if index is None:
+                    # Rebuild from disk - the save file itself is already current
+                    self.rebuild_index(user_id)
+                    return
+                if entry is None:
+                    index.pop(game_id, None)
+                else:
+                    index[game_id] = entry
+                self._write_index(user_id, index)
+        except Exception as e:
+            print(f"Save index error: {e}")
+    
     def save_game(self, user_id: str, game_id: str, state: GameState) -> bool:
         """
         Save game state to file.
         Returns True if successful.
         """
         try:
-            save_data = state.to_save_dict()
-            save_data["user_id"] = user_id
-            save_data["game_id"] = game_id
-            
+            snapshot = self.snapshot_save(user_id, game_id, state)
+        except Exception as e:
+            print(f"Save error: {e}")
+            return False
+        return self.save_snapshot(user_id, game_id, snapshot)
+    
+    def snapshot_save(self, user_id: str, game_id: str, state: GameState, full: bool = False) -> Dict:
+        """Serialize what a background auto-save will write (see save_snapshot).
+        Saves are rewritten whole here."""
+        save_data = state.to_save_dict()
+        save_data["user_id"] = user_id
+        save_data["game_id"] = game_id
+        return {"data": _dump_json_bytes(save_data), "meta": self._extract_meta(save_data)}
+    
+    def save_snapshot(self, user_id: str, game_id: str, snapshot: Dict) -> bool:
+        """
+        Write a snapshot_save() result to file.
+        Returns True if successful.
+        """
+        try:
             filepath = self._get_save_path(user_id, game_id)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+            _atomic_write(filepath, snapshot["data"])
+            self._update_index(user_id, game_id, snapshot["meta"])
             return True
         except Exception as e:
             print(f"Save error: {e}")
             return False
     
+    def save_games_batch(self, saves: List[tuple]) -> bool:
+        """
+        Save several games at once from (user_id, game_id, state) tuples.
+        All temp files are written and synced first, then renamed into place
+        together, with one index update per user.
+        Returns True if all were saved.
+        """
+        staged = []
+        entries: Dict[str, Dict[str, Dict]] = {}
+        try:
+            for user_id, game_id, state in saves:
+                save_data = state.to_save_dict()
+                save_data["user_id"] = user_id
+                save_data["game_id"] = game_id
+                
+                filepath = self._get_save_path(user_id, game_id)
+                staged.append((_write_tmp(filepath, _dump_json_bytes(save_data)), filepath))
+                entries.setdefault(user_id, {})[game_id] = self._extract_meta(save_data)
+            
+            for tmp_path, filepath in staged:
+                os.replace(tmp_path, filepath)
+            staged = []
+        except Exception as e:
+            print(f"Save error: {e}")
+            for tmp_path, _ in staged:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+        
+        for user_id, user_entries in entries.items():
+            with _index_lock(self._get_index_path(user_id)):
+                index = self._load_index(user_id)
+                if index is None:
+                    self.rebuild_index(user_id)
+                    continue
+                index.update(user_entries)
+                try:
+                    self._write_index(user_id, index)
+                except Exception as e:
+                    print(f"Save index error: {e}")
+        return True
+    
+    def save_delta(self, user_id: str, game_id: str, state: GameState) -> bool:
+        """Per-turn auto-save. Saves are rewritten whole here."""
+        return self.save_game(user_id, game_id, state)
+    
     def load_game(self, user_id: str, game_id: str) -> Optional[GameState]:
         """
         Load game state from file.
@@ -389,8 +989,8 @@ class GameSaveManager:
             if not os.path.exists(filepath):
                 return None
             
-            with open(filepath, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                save_data = _load_json_bytes(f.read())
             
             return GameState.from_save_dict(save_data)
         except Exception as e:
@@ -403,42 +1003,302 @@ class GameSaveManager:
             filepath = self._get_save_path(user_id, game_id)
             if os.path.exists(filepath):
                 os.remove(filepath)
+            self._update_index(user_id, game_id, None)
             return True
         except Exception:
             return False
     
-    def list_user_games(self, user_id: str) -> List[Dict]:
-        """List all saved games for a user"""
-        games = []
+    def rebuild_index(self, user_id: str) -> Dict[str, Dict]:
+        """
+        Rebuild a user's save index by reading every save file.
+        Slow path - only used when the index is missing or corrupt.
+        """
+        with _index_lock(self._get_index_path(user_id)):
+            return self._rebuild_index(user_id)
+    
+    def _rebuild_index(self, user_id: str) -> Dict[str, Dict]:
+        """rebuild_index, with the user's index lock held"""
         prefix = f"{user_id}_"
+        candidates = []
         
         try:
-            for filename in os.listdir(self.save_dir):
-                if filename.startswith(prefix) and filename.endswith('.json'):
-                    filepath = os.path.join(self.save_dir, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            save_data = json.load(f)
-                        
-                        games.append({
-                            "game_id": save_data.get("game_id", ""),
-                            "player_name": save_data.get("player_name", "Unknown"),
-                            "phase": save_data.get("phase", "unknown"),
-                            "current_era": save_data.get("current_era", {}).get("era_name", "Unknown") if save_data.get("current_era") else None,
-                            "total_turns": save_data.get("time_machine", {}).get("total_turns", 0),
-                            "saved_at": save_data.get("saved_at", ""),
-                            "started_at": save_data.get("started_at", "")
-                        })
-                    except Exception:
+            with os.scandir(self.save_dir) as it:
+                for dir_entry in it:
+                    name = dir_entry.name
+                    if not (name.startswith(prefix) and name.endswith('.json')):
+                        continue
+                    # Another user's index (user "bob" vs "bob_2.index.json")
+                    if name.endswith('.index.json'):
+                        continue
+                    if not dir_entry.is_file(follow_symlinks=False):
                         continue
+                    candidates.append(dir_entry)
         except Exception:
             pass
         
+        def read_meta(dir_entry) -> Optional[Dict]:
+            try:
+                entry = self._read_save_meta(dir_entry.path, dir_entry.name[len(prefix):-len('.json')])
+                if not entry["saved_at"]:
+                    entry["saved_at"] = datetime.fromtimestamp(dir_entry.stat().st_mtime).isoformat()
+                return entry
+            except Exception:
+                return None
+        
+        # Reads are I/O bound - overlap them once there are enough files
+        if len(candidates) < INDEX_REBUILD_POOL_MIN:
+            entries = [read_meta(c) for c in candidates]
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as pool:
+                entries = list(pool.map(read_meta, candidates))
+        index = {entry["game_id"]: entry for entry in entries if entry}
+        
+        try:
+            self._write_index(user_id, index)
+        except Exception as e:
+            print(f"Save index error: {e}")
+        return index
+    
+    def list_user_games(self, user_id: str) -> List[Dict]:
+        """List all saved games for a user"""
+        index = self._load_index(user_id)
+        if index is None:
+            index = self.rebuild_index(user_id)
+        games = list(index.values())
+        
         # Sort by saved_at, newest first
         games.sort(key=lambda x: x.get("saved_at", ""), reverse=True)
         return games
 
 
+class SQLiteSaveManager:
+    """
+    Manages saving and loading game states in a local SQLite database.
+    Runs in WAL mode so listings don't block on concurrent saves.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS saves (
+        user_id TEXT NOT NULL,
+        game_id TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        blob TEXT NOT NULL,
+        PRIMARY KEY (user_id, game_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_saves_user_updated ON saves(user_id, updated_at DESC);
+    """
+    
+    def __init__(self, db_path: str = SQLITE_SAVE_PATH):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+    
+    @contextmanager
+    def _connect(self):
+        """Open a connection; commit on success, rollback on error"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def save_game(self, user_id: str, game_id: str, state: GameState) -> bool:
+        """
+        Save game state to the database.
+        Returns True if successful.
+        """
+        try:
+            snapshot = self.snapshot_save(user_id, game_id, state)
+        except Exception as e:
+            print(f"SQLite save error: {e}")
+            return False
+        return self.save_snapshot(user_id, game_id, snapshot)
+    
+    def snapshot_save(self, user_id: str, game_id: str, state: GameState, full: bool = False) -> Dict:
+        """Serialize what a background auto-save will write (see save_snapshot).
+        Saves are rewritten whole here."""
+        save_data = state.to_save_dict()
+        save_data["user_id"] = user_id
+        save_data["game_id"] = game_id
+        return {"saved_at": save_data["saved_at"], "blob": _dump_json_bytes(save_data).decode('utf-8')}
+    
+    def save_snapshot(self, user_id: str, game_id: str, snapshot: Dict) -> bool:
+        """
+        Write a snapshot_save() result to the database.
+        Returns True if successful.
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO saves (user_id, game_id, updated_at, blob) VALUES (?, ?, ?, ?)",
+                    (user_id, game_id, snapshot["saved_at"], snapshot["blob"])
+                )
+            return True
+        except Exception as e:
+            print(f"SQLite save error: {e}")
+            return False
+    
+    def save_delta(self, user_id: str, game_id: str, state: GameState) -> bool:
+        """Per-turn auto-save. Saves are rewritten whole here."""
+        return self.save_game(user_id, game_id, state)
+    
+    def load_game(self, user_id: str, game_id: str) -> Optional[GameState]:
+        """
+        Load game state from the database.
+        Returns GameState or None if not found.
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT blob FROM saves WHERE user_id = ? AND game_id = ?",
+                    (user_id, game_id)
+                ).fetchone()
+            if not row:
+                return None
+            return GameState.from_save_dict(_load_json_bytes(row[0]))
+        except Exception as e:
+            print(f"SQLite load error: {e}")
+            return None
+    
+    def delete_game(self, user_id: str, game_id: str) -> bool:
+        """Delete a saved game"""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM saves WHERE user_id = ? AND game_id = ?", (user_id, game_id))
+            return True
+        except Exception:
+            return False
+    
+    def list_user_games(self, user_id: str) -> List[Dict]:
+        """List all saved games for a user, newest first"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """SELECT game_id,
+                              json_extract(blob, '$.player_name'),
+                              json_extract(blob, '$.phase'),
+                              json_extract(blob, '$.current_era.era_name'),
+                              json_extract(blob, '$.time_machine.total_turns'),
+                              updated_at,
+                              json_extract(blob, '$.started_at')
+                       FROM saves WHERE user_id = ?
+                       ORDER BY updated_at DESC""",
+                    (user_id,)
+                ).fetchall()
+        except Exception as e:
+            print(f"SQLite list error: {e}")
+            return []
+        
+        return [{
+            "game_id": game_id,
+            "player_name": player_name or "Unknown",
+            "phase": phase or "unknown",
+            "current_era": era_name,
+            "total_turns": total_turns or 0,
+            "saved_at": saved_at or "",
+            "started_at": started_at or "",
+        } for game_id, player_name, phase, era_name, total_turns, saved_at, started_at in rows]
+
+
+def create_save_manager():
+    """Create the save manager selected by SAVE_BACKEND"""
+    if SAVE_BACKEND == "sqlite":
+        return SQLiteSaveManager()
+    if SAVE_BACKEND == "files":
+        return GameSaveManager()
+    return DatabaseSaveManager()
+
+
+# Leaderboard and Annals only wrap their (stateless) database storage, so
+# one instance of each is shared by every session instead of rebuilt per call.
+_LEADERBOARD = None
+_ANNALS = None
+_SHARED_SCORING_LOCK = threading.Lock()
+
+
+def _get_leaderboard() -> Leaderboard:
+    """Lazily create the process-wide database-backed Leaderboard"""
+    global _LEADERBOARD
+    if _LEADERBOARD is None:
+        with _SHARED_SCORING_LOCK:
+            if _LEADERBOARD is None:
+                _LEADERBOARD = Leaderboard(storage=DatabaseLeaderboardStorage())
+    return _LEADERBOARD
+
+
+def _get_annals() -> AnnalsOfAnachron:
+    """Lazily create the process-wide AnnalsOfAnachron"""
+    global _ANNALS
+    if _ANNALS is None:
+        with _SHARED_SCORING_LOCK:
+            if _ANNALS is None:
+                _ANNALS = AnnalsOfAnachron()
+    return _ANNALS
+
+
+# Choice lines ("[A] ...") in a narrator response, scanned in one pass
+_CHOICE_LINE_RE = re.compile(r'^[^\S\n]*\[([A-C])\][^\S\n]*(.+)$', re.IGNORECASE | re.MULTILINE)
+_CHOICE_MARKER_RE = re.compile(r'\[[A-C]\]', re.IGNORECASE)
+_CHOICE_TRAILING_TAG_RE = re.compile(r'\s*<[^>]+>.*$')
+_CHOICE_TRAILING_SCORES_RE = re.compile(r'\s*SCORES:.*$', re.IGNORECASE)
+
+
+# Device indicator -> status text for DEVICE_STATUS messages
+DEVICE_STATUS_TEXT = {
+    indicator: MappingProxyType(text) for indicator, text in {
+        IndicatorState.DARK: {"status": "silent", "description": "The device is silent and cold."},
+        IndicatorState.FAINT_PULSE: {"status": "faint_pulse", "description": "A faint pulse stirs in the device."},
+        IndicatorState.STEADY_GLOW: {"status": "steady_glow", "description": "The device glows steadily."},
+        IndicatorState.BRIGHT_PULSE: {"status": "window_open", "description": "The device pulses urgently. The window is open."}
+    }.items()
+}  # Read-only: status payloads are built by unpacking these
+
+
+def _hidden_tags_closed(text: str) -> bool:
+    """True if every hidden/anchor tag block opened in text is also closed in it"""
+    lower = text.lower()
+    for name in HIDDEN_TAG_NAMES:
+        opened = lower.rfind(f'<{name}>')
+        if opened != -1 and lower.rfind(f'</{name}>') < opened:
+            return False
+    return True
+
+
+# Dice rolls drawn per refill of GameAPI._roll_cache
+D20_FACES = range(1, 21)
+ROLL_BATCH_SIZE = 64
+
+# How long the final score waits for a background portrait to include it
+# (a portrait that takes longer still reaches the Annals entry)
+PORTRAIT_WAIT_SECONDS = 5
+
+
+def _mutates_state(method):
+    """
+    Mark a GameAPI generator method as changing game state. Bumps the
+    state version when it starts and again when it finishes, so a
+    get_current_state() snapshot taken before or during it is not reused.
+    
+    Background saves are settled first, so every auto-save queued before
+    the change has been written when it starts.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._settle_saves()
+        self._state_version += 1
+        try:
+            return (yield from method(self, *args, **kwargs))
+        finally:
+            self._state_version += 1
+    return wrapper
+
+
 # =============================================================================
 # GAME API CLASS
 # =============================================================================
@@ -457,6 +1317,18 @@ class GameAPI:
     - Intent-based choice resolution
     """
     
+    # One instance per connected player - no per-instance __dict__.
+    # Every attribute set on a GameAPI (including by lab Quick Play) must be listed.
+    __slots__ = (
+        'user_id', 'state', 'narrator', 'current_era', '_selected_region',
+        'history', 'current_game', 'save_manager', 'game_id',
+        'model_override', 'temperature_override', 'dice_roll_override',
+        '_ending_narrative', 'last_dice_roll', '_portrait_state',
+        '_save_lock', '_save_queue', '_save_broken', '_save_thread',
+        '_rng', '_roll_cache', '_device_status',
+        '_state_version', '_state_snapshot',
+    )
+    
     def __init__(self, user_id: str = "default"):
         self.user_id = user_id
         self.state = GameState()
@@ -469,7 +1341,7 @@ class GameAPI:
         self.current_game = None
 
         # Save manager (database-backed)
-        self.save_manager = DatabaseSaveManager()
+        self.save_manager = create_save_manager()
 
         # Game ID for this session
         self.game_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -481,6 +1353,26 @@ class GameAPI:
         
         # Ending narrative for stay-forever endings
         self._ending_narrative = ""
+        
+        # Background AoA portrait (see _start_portrait_background)
+        self._portrait_state = None
+
+        # get_current_state() cache, invalidated by @_mutates_state methods
+        self._state_version = 0
+        self._state_snapshot = None
+
+        # Last device status payload (see _get_device_status)
+        self._device_status = None
+
+        # Per-session dice (see _roll_d20)
+        self._rng = random.Random()
+        self._roll_cache = []
+
+        # Background auto-save (see _queue_save)
+        self._save_lock = threading.Lock()
+        self._save_queue = deque()
+        self._save_broken = False
+        self._save_thread = None
     
     # =========================================================================
     # GAME FLOW
@@ -488,6 +1380,10 @@ class GameAPI:
     
     def start_game(self) -> Generator[Dict, None, None]:
         """Initialize a new game, yield setup messages"""
+        # Don't carry a previous game's ending into this one
+        self._ending_narrative = ""
+        self._portrait_state = None
+        
         yield emit(MessageType.TITLE, {
             "title": "ANACHRON",
             "tagline": "How will you fare in another era?"
@@ -498,6 +1394,7 @@ class GameAPI:
             "default": "Traveler"
         })
     
+    @_mutates_state
     def set_player_name(self, name: str) -> Generator[Dict, None, None]:
         """Set player name and move to region selection"""
         self.state.player_name = name if name.strip() else "Traveler"
@@ -518,6 +1415,7 @@ class GameAPI:
             ]
         })
     
+    @_mutates_state
     def set_region(self, region: str) -> Generator[Dict, None, None]:
         """Set region preference and show intro"""
         self._selected_region = RegionPreference.EUROPEAN if region == "european" else RegionPreference.WORLDWIDE
@@ -538,16 +1436,7 @@ class GameAPI:
         })
         
         # Show items
-        items = []
-        for item in self.state.inventory.modern_items:
-            items.append({
-                "id": item.id,
-                "name": item.name,
-                "description": item.description,
-                "uses": item.uses,
-                "utility": item.utility,
-                "risk": item.risk
-            })
+        items = [INTRO_ITEM_DATA[item.id] for item in self.state.inventory.modern_items]
         
         yield emit(MessageType.INTRO_ITEMS, {"items": items})
         
@@ -570,8 +1459,9 @@ class GameAPI:
             "goal": "Find a time and place where you want to stay. Build something worth staying for—people, purpose, freedom. When the window opens and you choose not to leave... that's when you've found happiness."
         })
         
-        yield emit(MessageType.WAITING_INPUT, {"action": "continue_to_era"})
+        yield emit_waiting_input({"action": "continue_to_era"})
     
+    @_mutates_state
     def enter_first_era(self) -> Generator[Dict, None, None]:
         """Enter the first random era"""
         yield from self._enter_random_era()
@@ -580,11 +1470,77 @@ class GameAPI:
     # SAVE/LOAD/RESUME
     # =========================================================================
     
+    def _queue_save(self, full: bool = False):
+        """
+        Auto-save in the background so the turn can finish without waiting
+        on the database. The state is serialized here, on the calling
+        thread, so the worker only writes bytes, in the order they were
+        queued. After a failed write the next snapshot is a full save, so
+        a lost delta never leaves a gap.
+        """
+        with self._save_lock:
+            full = full or self._save_broken
+        try:
+            snapshot = self.save_manager.snapshot_save(self.user_id, self.game_id, self.state, full=full)
+        except Exception as e:
+            logger.error(f"Auto-save snapshot failed: {e}")
+            with self._save_lock:
+                self._save_broken = True
+            return
+        with self._save_lock:
+            self._save_queue.append(snapshot)
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+                self._save_thread.start()
+    
+    def _save_worker(self):
+        """Write queued auto-save snapshots until none are left."""
+        while True:
+            with self._save_lock:
+                if not self._save_queue:
+                    self._save_thread = None
+                    return
+                snapshot = self._save_queue.popleft()
+                is_delta = "delta" in snapshot
+                # A delta after a failed write would apply onto the wrong
+                # base; the full save taken next covers it instead
+                skip = is_delta and self._save_broken
+            if skip:
+                continue
+            try:
+                saved = self.save_manager.save_snapshot(self.user_id, self.game_id, snapshot)
+            except Exception as e:
+                logger.error(f"Background auto-save failed: {e}")
+                saved = False
+            with self._save_lock:
+                if not saved:
+                    self._save_broken = True
+                elif not is_delta:
+                    self._save_broken = False
+    
+    def _settle_saves(self):
+        """Wait until every queued auto-save has been written.
+        Called before anything that mutates (see _mutates_state), saves,
+        loads or deletes the game. If a write failed, the state is saved
+        in full here instead."""
+        with self._save_lock:
+            thread = self._save_thread
+        if thread is not None:
+            thread.join()
+        if self._save_broken:
+            if self.save_manager.save_game(self.user_id, self.game_id, self.state):
+                self._save_broken = False
+            else:
+                logger.error("Auto-save retry failed; the next save will be a full save")
+    
     def save_game(self) -> Generator[Dict, None, None]:
         """Save current game state"""
-        # Store conversation history in state
+        self._settle_saves()
+        
+        # Conversation history is already bound to the narrator (see
+        # NarrativeEngine.set_era); only the evicted-turn summary needs copying
         if self.narrator:
-            self.state.conversation_history = self.narrator.get_conversation_history()
+            self.state.narrator_memory = self.narrator.get_memory_state()
         
         success = self.save_manager.save_game(self.user_id, self.game_id, self.state)
         
@@ -594,6 +1550,7 @@ class GameAPI:
             "message": "Game saved successfully" if success else "Failed to save game"
         })
     
+    @_mutates_state
     def load_game(self, game_id: str) -> Generator[Dict, None, None]:
         """Load a saved game"""
         loaded_state = self.save_manager.load_game(self.user_id, game_id)
@@ -614,8 +1571,10 @@ class GameAPI:
         # Restore narrator with conversation history
         self.narrator = NarrativeEngine(self.state)
         if self.current_era:
+            # set_era rebinds state.conversation_history, so take the saved list first
+            saved_history = self.state.conversation_history
             self.narrator.set_era(self.current_era)
-            self.narrator.restore_conversation(self.state.conversation_history)
+            self.narrator.restore_conversation(saved_history, self.state.narrator_memory)
         
         yield emit(MessageType.GAME_LOADED, {
             "success": True,
@@ -625,6 +1584,7 @@ class GameAPI:
             "current_era": self.state.current_era.era_name if self.state.current_era else None
         })
     
+    @_mutates_state
     def resume_game(self) -> Generator[Dict, None, None]:
         """
         Resume a loaded game, providing full context for the player to pick up.
@@ -646,13 +1606,10 @@ class GameAPI:
         
         # Current era info
         if self.state.current_era and self.current_era:
-            year = self.current_era['year']
-            year_str = f"{abs(year)} BCE" if year < 0 else f"{year} CE"
-            
             resume_data["era"] = {
                 "name": self.current_era['name'],
-                "year": year,
-                "year_display": year_str,
+                "year": self.current_era['year'],
+                "year_display": get_year_display(self.current_era),
                 "location": self.current_era['location'],
                 "time_in_era": self.state.current_era.time_in_era_description,
                 "turns_in_era": self.state.current_era.turns_in_era + 1,
@@ -683,16 +1640,17 @@ class GameAPI:
         # Re-filter choices for safety (in case save is from old version)
         if self.state.last_choices:
             window_active = self.state.time_machine.window_active
-            filtered_choices = filter_choices(
-                self.state.last_choices,
-                window_active,
-                self.state.can_stay_meaningfully
-            )
-            self.state.last_choices = filtered_choices
+            if window_active:
+                self.state.last_choices = filter_choices(
+                    self.state.last_choices,
+                    window_active,
+                    self.state.can_stay_meaningfully
+                )
+            filtered_choices = self.state.last_choices
             
             can_stay_forever = self.state.can_stay_meaningfully and window_active
             
-            yield emit(MessageType.CHOICES, {
+            yield emit_choices({
                 "choices": filtered_choices,
                 "can_quit": not can_stay_forever,
                 "window_open": window_active,
@@ -705,6 +1663,7 @@ class GameAPI:
     
     def list_saved_games(self) -> Generator[Dict, None, None]:
         """List all saved games for current user"""
+        self._settle_saves()
         games = self.save_manager.list_user_games(self.user_id)
         
         yield emit(MessageType.USER_GAMES, {
@@ -714,7 +1673,7 @@ class GameAPI:
     
     def get_leaderboard(self, global_board: bool = True, limit: int = 10) -> Generator[Dict, None, None]:
         """Get leaderboard data"""
-        leaderboard = Leaderboard(storage=DatabaseLeaderboardStorage())
+        leaderboard = _get_leaderboard()
         
         if global_board:
             scores = leaderboard.get_top_scores(limit)
@@ -736,7 +1695,7 @@ class GameAPI:
             limit: Number of entries per page (max 20)
             offset: Pagination offset
         """
-        annals = AnnalsOfAnachron()
+        annals = _get_annals()
         
         if user_only:
             result = annals.get_user_archive(self.user_id, limit=min(limit, 20), offset=offset)
@@ -772,7 +1731,7 @@ class GameAPI:
         """
         Get a single Annals entry by ID (for detail view / sharing).
         """
-        annals = AnnalsOfAnachron()
+        annals = _get_annals()
         entry = annals.get_entry(entry_id)
         
         if not entry:
@@ -810,6 +1769,7 @@ class GameAPI:
     # GAMEPLAY - CHOICE HANDLING
     # =========================================================================
     
+    @_mutates_state
     def make_choice(self, choice: str) -> Generator[Dict, None, None]:
         """
         Process a player choice (A, B, C, or Q).
@@ -820,20 +1780,15 @@ class GameAPI:
         """
         choice = choice.upper()
         
-        # =====================================================================
-        # DEBUG: Choice handling diagnosis
-        # =====================================================================
-        print("=" * 60)
-        print("DEBUG make_choice() ENTRY")
-        print("=" * 60)
-        print(f"  choice input: {choice}")
-        print(f"  window_active: {self.state.time_machine.window_active}")
-        print(f"  window_turns_remaining: {self.state.time_machine.window_turns_remaining}")
-        print(f"  current_era: {self.current_era['name'] if self.current_era else 'None'}")
-        print(f"  phase: {self.state.phase.value}")
-        print(f"  last_choices: {self.state.last_choices}")
-        print("-" * 60)
-        # =====================================================================
+        # Choice handling diagnosis (formatted only when DEBUG logging is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"make_choice: choice={choice} "
+                f"window_active={self.state.time_machine.window_active} "
+                f"window_turns_remaining={self.state.time_machine.window_turns_remaining} "
+                f"era={self.current_era['name'] if self.current_era else None} "
+                f"phase={self.state.phase.value} last_choices={self.state.last_choices}"
+            )
         
         # Handle quit
         if choice == 'Q':
@@ -853,14 +1808,8 @@ class GameAPI:
             window_open
         )
         
-        # =====================================================================
-        # DEBUG: Intent detection result
-        # =====================================================================
-        print(f"  window_open passed to intent: {window_open}")
-        print(f"  detected intent: {intent}")
-        print(f"  choice_text: {choice_text}")
-        print("=" * 60)
-        # =====================================================================
+        logger.debug("make_choice: window_open=%s intent=%s choice_text=%r",
+                     window_open, intent, choice_text)
         
         if intent is None:
             yield emit(MessageType.ERROR, {"message": f"Choice {choice} not found"})
@@ -868,12 +1817,12 @@ class GameAPI:
         
         # Route based on intent
         if intent == ChoiceIntent.LEAVE_ERA:
-            print("DEBUG: Routing to _handle_leaving()")
+            logger.debug("make_choice: routing to _handle_leaving()")
             yield from self._handle_leaving()
             return
         
         if intent == ChoiceIntent.STAY_FOREVER:
-            print("DEBUG: Routing to _handle_stay_forever()")
+            logger.debug("make_choice: routing to _handle_stay_forever()")
             # Double-check eligibility (should always pass if filter worked)
             if not self.state.can_stay_meaningfully:
                 yield emit(MessageType.ERROR, {
@@ -885,9 +1834,15 @@ class GameAPI:
             return
         
         # Intent is CONTINUE_STORY - process as normal turn
-        print("DEBUG: Routing to _process_story_turn()")
+        logger.debug("make_choice: routing to _process_story_turn()")
         yield from self._process_story_turn(choice)
     
+    def _roll_d20(self) -> int:
+        """Roll a d20, drawing rolls from the session RNG in batches"""
+        if not self._roll_cache:
+            self._roll_cache = self._rng.choices(D20_FACES, k=ROLL_BATCH_SIZE)
+        return self._roll_cache.pop()
+    
     def _process_story_turn(self, choice: str) -> Generator[Dict, None, None]:
         """
         Process a normal story turn (not leave/stay-forever).
@@ -900,17 +1855,17 @@ class GameAPI:
         - Filtering and emitting choices
         """
         # Roll dice for this turn (lab override if set)
-        roll = self.dice_roll_override if self.dice_roll_override is not None else random.randint(1, 20)
+        roll = self.dice_roll_override if self.dice_roll_override is not None else self._roll_d20()
         self.last_dice_roll = roll
 
         # Advance turn - this may open or close the window
         events = self.state.advance_turn()
         
-        yield emit(MessageType.LOADING, {"message": "The story unfolds..."})
+        yield emit_loading(LOADING_STORY)
         
         # Determine which prompt to use based on what happened
-        window_just_opened = events["window_opened"]
-        window_active_after_turn = events["window_active_after_turn"]
+        window_just_opened = events.window_opened
+        window_active_after_turn = events.window_active_after_turn
         
         if window_just_opened:
             # Window just opened - use window prompt
@@ -930,16 +1885,9 @@ class GameAPI:
             history_prefix = ""
         
         # Generate narrative
-        response = ""
-        generator = self.narrator.generate_streaming(
+        response = (yield from self.narrator.generate_streaming(
             prompt, model=self.model_override, temperature=self.temperature_override
-        )
-        try:
-            while True:
-                msg = next(generator)
-                yield msg
-        except StopIteration as e:
-            response = e.value if e.value else ""
+        )) or ""
 
         # Fallback if response is empty
         if not response:
@@ -965,11 +1913,14 @@ class GameAPI:
         
         # Filter choices - remove stay_forever if not eligible
         # This is the safety layer in case AI generated invalid options
-        filtered_choices = filter_choices(
-            raw_choices,
-            window_active_after_turn,
-            self.state.can_stay_meaningfully
-        )
+        if window_active_after_turn:
+            filtered_choices = filter_choices(
+                raw_choices,
+                window_active_after_turn,
+                self.state.can_stay_meaningfully
+            )
+        else:
+            filtered_choices = raw_choices
         
         # Store filtered choices for next submission
         self.state.set_last_turn(response, filtered_choices)
@@ -980,7 +1931,7 @@ class GameAPI:
         can_quit = not can_stay_forever
         
         # Emit choices to frontend
-        yield emit(MessageType.CHOICES, {
+        yield emit_choices({
             "choices": filtered_choices,
             "can_quit": can_quit,
             "window_open": window_active_after_turn,
@@ -992,30 +1943,26 @@ class GameAPI:
 
         # Emit window status messages
         if not window_just_opened:
-            if events["window_closing"]:
-                yield emit(MessageType.WINDOW_CLOSING, {
-                    "message": "The device pulses urgently. The window is closing..."
-                })
-            elif events["window_closed"]:
-                yield emit(MessageType.WINDOW_CLOSED, {
-                    "message": "The device falls silent. The moment has passed."
-                })
+            if events.window_closing:
+                yield emit(MessageType.WINDOW_CLOSING, WINDOW_CLOSING_DATA)
+            elif events.window_closed:
+                yield emit(MessageType.WINDOW_CLOSED, WINDOW_CLOSED_DATA)
                 self.state.phase = GamePhase.LIVING
         
         # Emit device status
         yield self._get_device_status()
         
-        # Auto-save after each turn
+        # Auto-save after each turn (delta - full saves happen on era changes)
         if self.narrator:
-            self.state.conversation_history = self.narrator.get_conversation_history()
-        self.save_manager.save_game(self.user_id, self.game_id, self.state)
+            self.state.narrator_memory = self.narrator.get_memory_state()
+        self._queue_save()
     
     def _re_emit_choices(self) -> Generator[Dict, None, None]:
         """Re-emit the current choices after an error."""
         window_open = self.state.time_machine.window_active
         can_stay_forever = self.state.can_stay_meaningfully and window_open
         
-        yield emit(MessageType.CHOICES, {
+        yield emit_choices({
             "choices": self.state.last_choices,
             "can_quit": not can_stay_forever,
             "window_open": window_open,
@@ -1023,8 +1970,15 @@ class GameAPI:
         })
     
     def get_current_state(self) -> Dict:
-        """Get the current game state for frontend rendering"""
-        return {
+        """
+        Get the current game state for frontend rendering.
+        Cached until the next state-changing call (see _mutates_state);
+        each caller gets its own copy of the top-level dict, but the nested
+        era/device/progress dicts are shared and must be treated as read-only.
+        """
+        if self._state_snapshot is not None and self._state_snapshot[0] == self._state_version:
+            return dict(self._state_snapshot[1])
+        snapshot = {
             "game_id": self.game_id,
             "user_id": self.user_id,
             "phase": self.state.phase.value,
@@ -1046,37 +2000,29 @@ class GameAPI:
             # NEW: Progress feedback for frontend display
             "progress": self.state.fulfillment.get_progress_for_frontend()
         }
+        self._state_snapshot = (self._state_version, snapshot)
+        return dict(snapshot)
     
     # =========================================================================
     # INTERNAL HELPERS
     # =========================================================================
     
+    def _available_eras(self) -> tuple:
+        """Era pool for the player's region preference"""
+        if self.state.region_preference == RegionPreference.EUROPEAN:
+            return EUROPEAN_ERAS
+        return WORLDWIDE_ERAS
+    
     def _enter_random_era(self) -> Generator[Dict, None, None]:
         """Enter a random era"""
         visited_ids = self.state.time_machine.eras_visited
         
         # Debug override: force specific era if DEBUG_MODE=true and DEBUG_ERA is set
-        debug_era_id = get_debug_era_id()
-        if debug_era_id:
-            debug_era = get_era_by_id(debug_era_id)
-            if debug_era:
-                print(f"[DEBUG] Forcing era: {debug_era_id}")
-                self.current_era = debug_era
-            else:
-                # Fallback to random if debug era not found
-                if self.state.region_preference == RegionPreference.EUROPEAN:
-                    available_eras = [e for e in ERAS if e['id'] in EUROPEAN_ERA_IDS]
-                else:
-                    available_eras = ERAS
-                self.current_era = select_random_era(available_eras, visited_ids)
+        if DEBUG_ERA is not None:
+            logger.info(f"[DEBUG] Forcing era: {DEBUG_ERA['id']}")
+            self.current_era = DEBUG_ERA
         else:
-            # Normal random era selection
-            if self.state.region_preference == RegionPreference.EUROPEAN:
-                available_eras = [e for e in ERAS if e['id'] in EUROPEAN_ERA_IDS]
-            else:
-                available_eras = ERAS
-            
-            self.current_era = select_random_era(available_eras, visited_ids)
+            self.current_era = select_random_era(self._available_eras(), visited_ids)
         self.state.enter_era(self.current_era)
         
         # Initialize milestone tracking for the new era (new - progress feedback)
@@ -1106,7 +2052,7 @@ class GameAPI:
         
         # Emit era arrival
         year = self.current_era['year']
-        year_str = f"{abs(year)} BCE" if year < 0 else f"{year} CE"
+        year_str = get_year_display(self.current_era)
         
         yield emit(MessageType.ERA_ARRIVAL, {
             "era_name": self.current_era['name'],
@@ -1129,22 +2075,15 @@ class GameAPI:
             "key_events": self.current_era.get('key_events', [])[:5]
         })
         
-        yield emit(MessageType.LOADING, {"message": "Arriving..."})
+        yield emit_loading(LOADING_ARRIVING)
         
         # Generate arrival narrative
         prompt = get_arrival_prompt(self.state, self.current_era)
-        response = ""
 
         # Stream the narrative - capture full response from generator
-        generator = self.narrator.generate_streaming(
+        response = (yield from self.narrator.generate_streaming(
             prompt, model=self.model_override, temperature=self.temperature_override
-        )
-        try:
-            while True:
-                msg = next(generator)
-                yield msg
-        except StopIteration as e:
-            response = e.value if e.value else ""
+        )) or ""
         
         if not response:
             response = self.narrator.messages[-1]["content"] if self.narrator.messages else ""
@@ -1171,18 +2110,13 @@ class GameAPI:
             era_name=self.current_era['name']
         )
         
-        # Parse choices and filter (window is always closed on arrival)
-        raw_choices = self._parse_choices(response)
-        filtered_choices = filter_choices(
-            raw_choices,
-            window_open=False,
-            can_stay_meaningfully=self.state.can_stay_meaningfully
-        )
+        # Parse choices (window is always closed on arrival, so nothing to filter)
+        filtered_choices = self._parse_choices(response)
         
         # Store for session resume
         self.state.set_last_turn(response, filtered_choices)
         
-        yield emit(MessageType.CHOICES, {
+        yield emit_choices({
             "choices": filtered_choices,
             "can_quit": True
         })
@@ -1195,42 +2129,40 @@ class GameAPI:
         
         # Auto-save
         if self.narrator:
-            self.state.conversation_history = self.narrator.get_conversation_history()
-        self.save_manager.save_game(self.user_id, self.game_id, self.state)
+            self.state.narrator_memory = self.narrator.get_memory_state()
+        self._queue_save(full=True)
+    
+    def _stream_premium(self, prompt: str) -> Generator[Dict, None, str]:
+        """
+        Stream a premium-model narrative and return the full response,
+        falling back to the last recorded message if the stream returned nothing.
+        """
+        response = yield from self.narrator.generate_streaming(prompt, model=PREMIUM_MODEL)
+        if not response:
+            response = self.narrator.messages[-1]["content"] if self.narrator.messages else ""
+        return response
     
     def _handle_leaving(self) -> Generator[Dict, None, None]:
         """Handle player choosing to leave"""
         self.state.choose_to_travel()
         
-        yield emit(MessageType.DEPARTURE, {
-            "title": "DEPARTURE",
-            "message": "You activate the time machine..."
-        })
+        yield emit(MessageType.DEPARTURE, DEPARTURE_DATA)
         
-        yield emit(MessageType.LOADING, {"message": "Reality shifts..."})
+        yield emit_loading(LOADING_REALITY_SHIFTS)
         
         # Generate departure narrative (premium model — leaving is emotionally weighted)
         prompt = get_leaving_prompt(self.state)
-        response = ""
 
         # Stream the narrative - capture full response from generator
-        generator = self.narrator.generate_streaming(prompt, model=PREMIUM_MODEL)
-        try:
-            while True:
-                msg = next(generator)
-                yield msg
-        except StopIteration as e:
-            response = e.value if e.value else ""
-        
-        if not response:
-            response = self.narrator.messages[-1]["content"] if self.narrator.messages else ""
+        response = yield from self._stream_premium(prompt)
         
         # Record departure
         if self.current_game:
             self.history.add_narrative(self.current_game, "[You activate the time machine]\n" + response)
         
-        yield emit(MessageType.WAITING_INPUT, {"action": "continue_to_next_era"})
+        yield emit_waiting_input(WAIT_NEXT_ERA)
     
+    @_mutates_state
     def continue_to_next_era(self) -> Generator[Dict, None, None]:
         """Continue to the next era after departure"""
         yield from self._enter_random_era()
@@ -1240,63 +2172,53 @@ class GameAPI:
         # =====================================================================
         # DEBUG: Verify data flow to ending prompt
         # =====================================================================
-        print("=" * 60)
-        print("DEBUG: ENDING DATA FLOW CHECK")
-        print("=" * 60)
-        
-        # 1. Anchor values (should be non-zero after real gameplay)
-        print(f"Belonging: {self.state.fulfillment.belonging.value}")
-        print(f"Legacy: {self.state.fulfillment.legacy.value}")
-        print(f"Freedom: {self.state.fulfillment.freedom.value}")
-        print(f"Ending type: {self.state.fulfillment.get_ending_type()}")
-        print("-" * 40)
-        
-        # 2. Event log (should have entries)
-        print(f"Total events logged: {len(self.state.game_events)}")
-        print(f"Event types: {set(e['type'] for e in self.state.game_events)}")
-        print("-" * 40)
-        
-        # 3. Key NPCs (should have names if <key_npc> tags were parsed)
-        relationship_events = self.state.get_events_by_type("relationship")
-        print(f"Relationship events: {len(relationship_events)}")
-        npc_names = [e.get('name') for e in relationship_events[:5]]
-        print(f"NPC names: {npc_names}")
-        print("-" * 40)
-        
-        # 4. Wisdom moments (should have IDs if <wisdom> tags were parsed)
-        wisdom_events = self.state.get_events_by_type("wisdom")
-        print(f"Wisdom events: {len(wisdom_events)}")
-        wisdom_ids = [e.get('id') for e in wisdom_events[:5]]
-        print(f"Wisdom IDs: {wisdom_ids}")
-        print("-" * 40)
-        
-        # 5. Character name (should be set from arrival)
-        char_name = self.state.current_era.character_name if self.state.current_era else 'NO ERA'
-        print(f"Character name: {char_name}")
-        print("-" * 40)
-        
-        # 6. Era info
-        if self.current_era:
-            print(f"Current era: {self.current_era.get('name', 'Unknown')}")
-            print(f"Time in era: {self.state.current_era.time_in_era_description if self.state.current_era else 'Unknown'}")
-            print(f"Turns in era: {self.state.current_era.turns_in_era if self.state.current_era else 0}")
-        print("-" * 40)
-        
-        # 7. Era history (for "previous lives" context in prompt)
-        print(f"Era history count: {len(self.state.era_history)}")
-        for h in self.state.era_history[-3:]:
-            print(f"  - {h['era_name']}: {h.get('character_name', 'unnamed')}, {h['turns']} turns")
-        print("-" * 40)
-        
-        # 8. Conversation history (verify AI has full context)
-        print(f"Conversation messages: {len(self.narrator.messages) if self.narrator else 0}")
-        print("-" * 40)
-        
-        # 9. Ripple conditions (special content when belonging/legacy >= 40)
-        belonging_val = self.state.fulfillment.belonging.value
-        legacy_val = self.state.fulfillment.legacy.value
-        print(f"Ripple enabled: {belonging_val >= 40 or legacy_val >= 40}")
-        print("=" * 60)
+        if logger.isEnabledFor(logging.DEBUG):
+            state = self.state
+            fulfillment = state.fulfillment
+            era_state = state.current_era
+            logger.debug("ENDING DATA FLOW CHECK")
+            
+            # 1. Anchor values (should be non-zero after real gameplay)
+            logger.debug("Belonging: %s, Legacy: %s, Freedom: %s, Ending type: %s",
+                         fulfillment.belonging.value, fulfillment.legacy.value,
+                         fulfillment.freedom.value, fulfillment.get_ending_type())
+            
+            # 2. Event log (should have entries)
+            logger.debug("Total events logged: %d, Event types: %s",
+                         len(state.game_events), state.get_event_types())
+            
+            # 3. Key NPCs (should have names if <key_npc> tags were parsed)
+            relationship_events = state.get_events_by_type("relationship")
+            logger.debug("Relationship events: %d, NPC names: %s",
+                         len(relationship_events), [e.get('name') for e in relationship_events[:5]])
+            
+            # 4. Wisdom moments (should have IDs if <wisdom> tags were parsed)
+            wisdom_events = state.get_events_by_type("wisdom")
+            logger.debug("Wisdom events: %d, Wisdom IDs: %s",
+                         len(wisdom_events), [e.get('id') for e in wisdom_events[:5]])
+            
+            # 5. Character name (should be set from arrival)
+            logger.debug("Character name: %s", era_state.character_name if era_state else 'NO ERA')
+            
+            # 6. Era info
+            if self.current_era:
+                logger.debug("Current era: %s, Time in era: %s, Turns in era: %s",
+                             self.current_era.get('name', 'Unknown'),
+                             era_state.time_in_era_description if era_state else 'Unknown',
+                             era_state.turns_in_era if era_state else 0)
+            
+            # 7. Era history (for "previous lives" context in prompt)
+            logger.debug("Era history count: %d", len(state.era_history))
+            for h in state.era_history[-3:]:
+                logger.debug("  - %s: %s, %s turns",
+                             h['era_name'], h.get('character_name', 'unnamed'), h['turns'])
+            
+            # 8. Conversation history (verify AI has full context)
+            logger.debug("Conversation messages: %d", len(self.narrator.messages) if self.narrator else 0)
+            
+            # 9. Ripple conditions (special content when belonging/legacy >= 40)
+            logger.debug("Ripple enabled: %s",
+                         fulfillment.belonging.value >= 40 or fulfillment.legacy.value >= 40)
         # END DEBUG
         
         yield emit(MessageType.STAYING_FOREVER, {
@@ -1308,23 +2230,13 @@ class GameAPI:
             ]
         })
         
-        yield emit(MessageType.LOADING, {"message": "Your story concludes..."})
+        yield emit_loading({"message": "Your story concludes..."})
         
         # Generate ending narrative (premium model for quality)
         prompt = get_staying_ending_prompt(self.state, self.current_era)
-        response = ""
 
         # Stream the narrative - capture full response from generator
-        generator = self.narrator.generate_streaming(prompt, model=PREMIUM_MODEL)
-        try:
-            while True:
-                msg = next(generator)
-                yield msg
-        except StopIteration as e:
-            response = e.value if e.value else ""
-        
-        if not response:
-            response = self.narrator.messages[-1]["content"] if self.narrator.messages else ""
+        response = yield from self._stream_premium(prompt)
         
         # Record ending
         if self.current_game:
@@ -1344,19 +2256,13 @@ class GameAPI:
             logger.error(f"Portrait background start failed (non-fatal): {e}")
 
         # Wait for user to click continue before showing score
-        yield emit(MessageType.WAITING_INPUT, {"action": "continue_to_score"})
+        yield emit_waiting_input({"action": "continue_to_score"})
     
     def _start_portrait_background(self):
         """Start portrait generation in a background thread while player reads ending narrative."""
-        try:
-            import portrait_generator
-            if not portrait_generator.OPENAI_AVAILABLE:
-                return
-        except ImportError:
+        if not PORTRAITS_AVAILABLE:
             return
 
-        import threading
-
         era = self.state.current_era
         portrait_data = {
             'final_era': era.era_name if era else 'Unknown',
@@ -1368,7 +2274,7 @@ class GameAPI:
             'freedom_score': self.state.fulfillment.freedom.value,
             'key_npcs': [e.get('npc_name', '') for e in self.state.get_events_by_type('relationship')],
             'items_used': [e.get('item_name', '') for e in self.state.get_events_by_type('item_use')],
-            'player_narrative': getattr(self, '_ending_narrative', ''),
+            'player_narrative': self._ending_narrative,
             'historian_narrative': '',  # Not yet generated — sufficient for scene extraction
         }
         image_id = f"portrait_{self.game_id}"
@@ -1379,15 +2285,21 @@ class GameAPI:
             'entry_id': None,        # Set later when AoA entry is saved
             'serving_path': None,    # Set by background thread when done
             'done': False,
+            'ready': threading.Event(),  # Set when generation ends, even on failure
             'lock': threading.Lock(),
         }
 
         def _generate():
-            path = portrait_generator.generate_portrait_from_data(portrait_data, image_id)
+            path = None
+            try:
+                path = portrait_generator.generate_portrait_from_data(portrait_data, image_id)
+            except Exception as e:
+                logger.error(f"Portrait generation failed: {e}")
             with self._portrait_state['lock']:
                 self._portrait_state['serving_path'] = path
                 self._portrait_state['done'] = True
                 entry_id = self._portrait_state['entry_id']
+            self._portrait_state['ready'].set()
             # Link to AoA entry if it has been saved already
             if path and entry_id:
                 try:
@@ -1398,14 +2310,26 @@ class GameAPI:
         threading.Thread(target=_generate, daemon=True).start()
         logger.info(f"Portrait generation started in background for game {self.game_id}")
 
-    def continue_to_score(self) -> Generator[Dict, None, None]:
-        """Continue to show the final score after the narrative"""
+    @_mutates_state
+    def continue_to_score(self, portrait_wait: float = PORTRAIT_WAIT_SECONDS) -> Generator[Dict, None, None]:
+        """
+        Continue to show the final score after the narrative. The score
+        waits up to portrait_wait seconds for a portrait still being drawn
+        so it can carry the portrait; one that finishes during cleanup
+        follows as a portrait_ready update.
+        """
         # Calculate and emit score, passing the stored ending narrative
-        ending_narrative = getattr(self, '_ending_narrative', '')
-        yield from self._emit_final_score(ending_narrative=ending_narrative)
+        ending_narrative = self._ending_narrative
+        portrait_entry_id = yield from self._emit_final_score(
+            ending_narrative=ending_narrative, portrait_wait=portrait_wait
+        )
         
         # Delete save file (game is complete)
+        self._settle_saves()
         self.save_manager.delete_game(self.user_id, self.game_id)
+        
+        if portrait_entry_id:
+            yield from self._emit_portrait_if_ready(portrait_entry_id)
     
     def _handle_quit(self) -> Generator[Dict, None, None]:
         """Handle player choosing to quit"""
@@ -1419,22 +2343,12 @@ class GameAPI:
         
         # Generate quit narrative with historical context
         if self.current_era and self.narrator:
-            yield emit(MessageType.LOADING, {"message": "Preparing your debrief..."})
+            yield emit_loading({"message": "Preparing your debrief..."})
             
             prompt = get_quit_ending_prompt(self.state, self.current_era)
-            response = ""
 
             # Stream the narrative (premium model for quality)
-            generator = self.narrator.generate_streaming(prompt, model=PREMIUM_MODEL)
-            try:
-                while True:
-                    msg = next(generator)
-                    yield msg
-            except StopIteration as e:
-                response = e.value if e.value else ""
-            
-            if not response:
-                response = self.narrator.messages[-1]["content"] if self.narrator.messages else ""
+            response = yield from self._stream_premium(prompt)
             
             # Store ending narrative (raw - tags stripped before display)
             self._ending_narrative = response
@@ -1451,14 +2365,21 @@ class GameAPI:
         self.state.end_game()
         
         # Calculate and emit score
-        ending_narrative = getattr(self, '_ending_narrative', '')
+        ending_narrative = self._ending_narrative
         yield from self._emit_final_score(ending_type_override="abandoned", ending_narrative=ending_narrative)
         
         # Delete save file (game is complete)
+        self._settle_saves()
         self.save_manager.delete_game(self.user_id, self.game_id)
     
-    def _emit_final_score(self, ending_type_override: str = None, ending_narrative: str = "") -> Generator[Dict, None, None]:
-        """Calculate and emit final score, and create Annals of Anachron entry if qualified"""
+    def _emit_final_score(self, ending_type_override: str = None, ending_narrative: str = "",
+                          portrait_wait: float = 0) -> Generator[Dict, None, Optional[str]]:
+        """
+        Calculate and emit final score, and create Annals of Anachron entry if qualified.
+        A background portrait gets up to portrait_wait seconds to finish so
+        the score can include it. Returns the entry id when the portrait is
+        still being drawn (see _emit_portrait_if_ready), else None.
+        """
         score = calculate_score(
             self.state, 
             ending_type_override=ending_type_override,
@@ -1472,57 +2393,49 @@ class GameAPI:
             self.history.end_game(self.current_game, score)
         
         # Add to leaderboard (database-backed)
-        leaderboard = Leaderboard(storage=DatabaseLeaderboardStorage())
+        leaderboard = _get_leaderboard()
         rank = leaderboard.add_score(score)
         
         # Create Annals of Anachron entry if qualified
         aoa_entry = None
         aoa_data = None
-        annals = AnnalsOfAnachron()
+        annals = _get_annals()
         
         # =====================================================================
         # DEBUG: AoA Entry Creation Check
         # =====================================================================
-        print("=" * 60)
-        print("DEBUG: AOA ENTRY DATA CHECK")
-        print("=" * 60)
-        
-        # 1. Score data that feeds into AoA
-        print(f"Score - turns_survived: {score.turns_survived}")
-        print(f"Score - eras_visited: {score.eras_visited}")
-        print(f"Score - ending_type: {score.ending_type}")
-        print(f"Score - total: {score.total}")
-        print(f"Score - fulfillment: {score.belonging_score + score.legacy_score + score.freedom_score}")
-        print(f"Score - ending_narrative length: {len(score.ending_narrative) if score.ending_narrative else 0}")
-        print("-" * 40)
-        
-        # 2. Qualification check (thresholds)
-        from scoring import AOA_THRESHOLDS
-        total_fulfillment = score.belonging_score + score.legacy_score + score.freedom_score
-        print(f"Qualification thresholds:")
-        print(f"  min_turns: {AOA_THRESHOLDS['min_turns']} (have: {score.turns_survived})")
-        print(f"  min_eras: {AOA_THRESHOLDS['min_eras']} (have: {score.eras_visited})")
-        print(f"  min_fulfillment: {AOA_THRESHOLDS['min_fulfillment']} (have: {total_fulfillment})")
-        print(f"  excluded_endings: {AOA_THRESHOLDS['excluded_endings']} (have: {score.ending_type})")
-        print("-" * 40)
-        
-        # 3. Character name from current era
-        char_name = self.state.current_era.character_name if self.state.current_era else 'NO ERA'
-        era_year = self.state.current_era.era_year if self.state.current_era else 0
-        print(f"Character name: {char_name}")
-        print(f"Era year: {era_year}")
-        print("-" * 40)
-        
-        # 4. Key events for AoA
-        relationship_events = self.state.get_events_by_type("relationship")
-        wisdom_events = self.state.get_events_by_type("wisdom")
-        item_events = self.state.get_events_by_type("item_use")
-        defining_events = self.state.get_events_by_type("defining_moment")
-        print(f"Relationship events: {len(relationship_events)}")
-        print(f"Wisdom events: {len(wisdom_events)}")
-        print(f"Item use events: {len(item_events)}")
-        print(f"Defining moment events: {len(defining_events)}")
-        print("=" * 60)
+        if logger.isEnabledFor(logging.DEBUG):
+            era_state = self.state.current_era
+            total_fulfillment = score.belonging_score + score.legacy_score + score.freedom_score
+            logger.debug("AOA ENTRY DATA CHECK")
+            
+            # 1. Score data that feeds into AoA
+            logger.debug("Score - turns_survived: %s, eras_visited: %s, ending_type: %s, "
+                         "total: %s, fulfillment: %s, ending_narrative length: %d",
+                         score.turns_survived, score.eras_visited, score.ending_type,
+                         score.total, total_fulfillment,
+                         len(score.ending_narrative) if score.ending_narrative else 0)
+            
+            # 2. Qualification check (thresholds)
+            logger.debug("Qualification thresholds: min_turns %s (have: %s), min_eras %s (have: %s), "
+                         "min_fulfillment %s (have: %s), excluded_endings %s (have: %s)",
+                         AOA_THRESHOLDS['min_turns'], score.turns_survived,
+                         AOA_THRESHOLDS['min_eras'], score.eras_visited,
+                         AOA_THRESHOLDS['min_fulfillment'], total_fulfillment,
+                         AOA_THRESHOLDS['excluded_endings'], score.ending_type)
+            
+            # 3. Character name from current era
+            logger.debug("Character name: %s, Era year: %s",
+                         era_state.character_name if era_state else 'NO ERA',
+                         era_state.era_year if era_state else 0)
+            
+            # 4. Key events for AoA
+            logger.debug("Relationship events: %d, Wisdom events: %d, Item use events: %d, "
+                         "Defining moment events: %d",
+                         len(self.state.get_events_by_type("relationship")),
+                         len(self.state.get_events_by_type("wisdom")),
+                         len(self.state.get_events_by_type("item_use")),
+                         len(self.state.get_events_by_type("defining_moment")))
         # END DEBUG
         
         is_stay_ending = ending_type_override is None and score.ending_type != "abandoned"
@@ -1540,16 +2453,16 @@ class GameAPI:
                 annals.save_entry(aoa_entry)
 
                 # Link background portrait to this AoA entry (handles race condition both ways)
-                if hasattr(self, '_portrait_state'):
+                portrait_path = None
+                if self._portrait_state is not None:
+                    self._portrait_state['ready'].wait(portrait_wait)
                     with self._portrait_state['lock']:
                         self._portrait_state['entry_id'] = aoa_entry.entry_id
                         # Portrait already finished while player was reading narrative/score — update now
                         if self._portrait_state['done'] and self._portrait_state['serving_path']:
+                            portrait_path = self._portrait_state['serving_path']
                             try:
-                                import portrait_generator
-                                portrait_generator._update_aoa_portrait(
-                                    aoa_entry.entry_id, self._portrait_state['serving_path'], ''
-                                )
+                                portrait_generator._update_aoa_portrait(aoa_entry.entry_id, portrait_path, '')
                             except Exception as e:
                                 logger.error(f"Portrait DB update (immediate) failed: {e}")
 
@@ -1563,6 +2476,8 @@ class GameAPI:
                     "final_era": aoa_entry.final_era,
                     "final_era_year": aoa_entry.final_era_year,
                 }
+                if portrait_path:
+                    aoa_data["portrait_image_path"] = portrait_path
             else:
                 aoa_data = {
                     "qualified": False,
@@ -1609,28 +2524,59 @@ class GameAPI:
             response_data["annals"] = aoa_data
         
         yield emit(MessageType.FINAL_SCORE, response_data)
+        
+        # A portrait still being drawn may follow the score as an update
+        if aoa_entry and aoa_data.get("qualified") and "portrait_image_path" not in aoa_data:
+            return aoa_entry.entry_id
+        return None
+    
+    def _emit_portrait_if_ready(self, entry_id: str) -> Generator[Dict, None, None]:
+        """Emit a portrait that finished after the score was sent, without waiting for one"""
+        portrait_state = self._portrait_state
+        if portrait_state is None:
+            return
+        if not portrait_state['ready'].is_set():
+            logger.info(f"Portrait for {entry_id} not ready yet; it will appear in the Annals")
+            return
+        path = portrait_state['serving_path']
+        if path:
+            yield emit(MessageType.PORTRAIT_READY, {
+                "entry_id": entry_id,
+                "portrait_image_path": path
+            })
     
     def _get_device_status(self) -> Dict:
-        """Get device status message"""
-        indicator = self.state.time_machine.indicator
-        
-        status_map = {
-            IndicatorState.DARK: {"status": "silent", "description": "The device is silent and cold."},
-            IndicatorState.FAINT_PULSE: {"status": "faint_pulse", "description": "A faint pulse stirs in the device."},
-            IndicatorState.STEADY_GLOW: {"status": "steady_glow", "description": "The device glows steadily."},
-            IndicatorState.BRIGHT_PULSE: {"status": "window_open", "description": "The device pulses urgently. The window is open."}
-        }
+        """
+        Get device status message.
         
-        status_data = status_map.get(indicator, status_map[IndicatorState.DARK])
-        status_data["window_active"] = self.state.time_machine.window_active
-        status_data["window_turns_remaining"] = self.state.time_machine.window_turns_remaining
+        The status usually doesn't change from one turn to the next, so the
+        last payload is reused while its inputs are unchanged. A change builds
+        a new dict; payloads already yielded are never mutated.
+        """
+        time_machine = self.state.time_machine
+        current_era = self.state.current_era
+        key = (
+            time_machine.indicator,
+            time_machine.window_active,
+            time_machine.window_turns_remaining,
+            (self.state.eras_count, current_era.turns_in_era, current_era.time_in_era_description)
+            if current_era else None,
+        )
         
-        if self.state.current_era:
-            status_data["era_number"] = self.state.eras_count
-            status_data["turn_in_era"] = self.state.current_era.turns_in_era + 1
-            status_data["time_in_era"] = self.state.current_era.time_in_era_description
+        if self._device_status is None or self._device_status[0] != key:
+            status_data = {
+                **DEVICE_STATUS_TEXT.get(key[0], DEVICE_STATUS_TEXT[IndicatorState.DARK]),
+                "window_active": key[1],
+                "window_turns_remaining": key[2],
+            }
+            
+            if current_era:
+                status_data["era_number"] = key[3][0]
+                status_data["turn_in_era"] = key[3][1] + 1
+                status_data["time_in_era"] = key[3][2]
+            self._device_status = (key, status_data)
         
-        return emit(MessageType.DEVICE_STATUS, status_data)
+        return emit_device_status(self._device_status[1])
     
     def _process_response(self, response: str, is_arrival: bool = False) -> Dict:
         """
@@ -1667,21 +2613,24 @@ class GameAPI:
             self.state.inventory.use_item(item_id)
             self.state.log_event("item_use", item_id=item_id)
         
+        # Event tags (name, NPCs, wisdom) in one scan
+        events = parse_all_events(response)
+        
         # Parse character name (primarily on arrival)
         if is_arrival:
-            char_name = parse_character_name(response)
+            char_name = events["character_name"]
             if char_name:
                 if self.state.current_era:
                     self.state.current_era.character_name = char_name
                 self.state.log_event("character_named", name=char_name)
         
         # Parse key NPCs
-        npcs = parse_key_npcs(response)
+        npcs = events["key_npcs"]
         for npc_name in npcs:
             self.state.log_event("relationship", name=npc_name)
         
         # Parse wisdom moments and look up full data
-        wisdom_id = parse_wisdom_moment(response)
+        wisdom_id = events["wisdom_id"]
         if wisdom_id:
             self.state.log_event("wisdom", id=wisdom_id)
             # Look up full wisdom data from current era
@@ -1699,27 +2648,42 @@ class GameAPI:
     
     def _parse_choices(self, response: str) -> List[Dict]:
         """Extract choices from response"""
+        # Choices close out the narrative: only clean and scan from the line
+        # with the first [A]/[B]/[C], unless a hidden tag opened before it is
+        # still open there (tag stripping could then span into the choices)
+        marker = _CHOICE_MARKER_RE.search(response)
+        if marker is None:
+            return []
+        start = response.rfind('\n', 0, marker.start()) + 1
+        if start and _hidden_tags_closed(response[:start]):
+            response = response[start:]
+        
         # Strip both anchor tags and event tags
         clean_response = strip_anchor_tags(response)
         clean_response = strip_event_tags(clean_response)
         # Strip markdown bold markers so **[A]** still matches
-        clean_response = re.sub(r'\*\*', '', clean_response)
+        clean_response = clean_response.replace('**', '')
 
         choices = []
         for line in clean_response.split('\n'):
-            line = line.strip()
-            match = re.match(r'^\[([A-C])\]\s*(.+)$', line, re.IGNORECASE)
-            if match:
-                choice_text = match.group(2).strip()
-                choice_text = re.sub(r'\s*<[^>]+>.*$', '', choice_text)
-                choice_text = re.sub(r'\s*SCORES:.*$', '', choice_text, flags=re.IGNORECASE)
-                if choice_text and len(choice_text) > 3:
-                    choices.append({
-                        'id': match.group(1).upper(),
-                        'text': choice_text
-                    })
+            # Cheap prefilter: only lines opening with '[' can be choices
+            if not line.lstrip().startswith('['):
+                continue
+            match = _CHOICE_LINE_RE.match(line)
+            if match is None:
+                continue
+            choice_text = match.group(2).strip()
+            choice_text = _CHOICE_TRAILING_TAG_RE.sub('', choice_text)
+            choice_text = _CHOICE_TRAILING_SCORES_RE.sub('', choice_text)
+            if choice_text and len(choice_text) > 3:
+                choices.append({
+                    'id': match.group(1).upper(),
+                    'text': choice_text
+                })
+                if len(choices) == 3:
+                    break
         
-        return choices[:3]
+        return choices
 
 
 # =============================================================================
@@ -1730,6 +2694,11 @@ class GameSession:
     """
     Simplified wrapper that collects generator output into lists.
     Useful for request/response style APIs (e.g., REST endpoints).
+    
+    The *_stream variants return the API generator itself, for transports
+    that can send messages as they are produced (e.g. the Socket.IO server).
+    Only AI-backed actions have them: their narrative_chunk messages arrive
+    while the model is still writing. Everything else is quick and batched.
     """
     
     def __init__(self, user_id: str = "default"):
@@ -1760,8 +2729,34 @@ class GameSession:
         return list(self.api.continue_to_next_era())
     
     def continue_to_score(self) -> List[Dict]:
-        """Continue to show final score after ending narrative"""
-        return list(self.api.continue_to_score())
+        """
+        Continue to show final score after ending narrative. Does not wait
+        for a portrait still being drawn; the score carries it only if it is
+        already done, otherwise it is linked to the Annals entry when done.
+        """
+        return list(self.api.continue_to_score(portrait_wait=0))
+    
+    # Streaming variants (see class docstring)
+    
+    def enter_first_era_stream(self) -> Generator[Dict, None, None]:
+        """Enter first era, yielding messages as they are produced"""
+        return self.api.enter_first_era()
+    
+    def choose_stream(self, choice: str) -> Generator[Dict, None, None]:
+        """Make a choice, yielding messages as they are produced"""
+        return self.api.make_choice(choice)
+    
+    def continue_to_next_era_stream(self) -> Generator[Dict, None, None]:
+        """Continue after departure, yielding messages as they are produced"""
+        return self.api.continue_to_next_era()
+    
+    def continue_to_score_stream(self) -> Generator[Dict, None, None]:
+        """
+        Continue to the final score, yielding messages as they are produced
+        (the score waits briefly for a still-running portrait; see
+        GameAPI.continue_to_score)
+        """
+        return self.api.continue_to_score()
     
     def get_state(self) -> Dict:
         """Get current state"""
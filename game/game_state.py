@@ -11,7 +11,7 @@ Includes full serialization support for save/load functionality.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple
 from datetime import datetime
 from enum import Enum
 
@@ -42,7 +42,27 @@ class GamePhase(Enum):
     ENDED = "ended"             # Game complete
 
 
-@dataclass
+class TurnEvents(NamedTuple):
+    """What happened to the window during GameState.advance_turn"""
+    window_opened: bool             # Window just opened THIS turn
+    window_closing: bool            # Window is on its last turn
+    window_closed: bool             # Window just closed (player let it expire)
+    window_active_after_turn: bool  # Window is active after this turn
+
+
+# time_in_era_description by turns_in_era, up to two years.
+# 7 turns = 1 year, so each turn is ~7-8 weeks
+_TIME_IN_ERA = (
+    "just arrived",
+    "a few weeks",
+    "a couple months",
+    "several months", "several months",
+    "most of a year", "most of a year",
+    "about a year",
+) + tuple(f"about {turns // 7} years" for turns in range(8, 15))
+
+
+@dataclass(slots=True)
 class EraState:
     """State for the current era"""
     
@@ -70,25 +90,11 @@ class EraState:
     def time_in_era_description(self) -> str:
         """Human-readable time spent in era"""
         turns = self.turns_in_era
-        
-        # 7 turns = 1 year, so each turn is ~7-8 weeks
-        if turns == 0:
-            return "just arrived"
-        elif turns == 1:
-            return "a few weeks"
-        elif turns == 2:
-            return "a couple months"
-        elif turns <= 4:
+        if 0 <= turns < len(_TIME_IN_ERA):
+            return _TIME_IN_ERA[turns]
+        if turns < 0:
             return "several months"
-        elif turns <= 6:
-            return "most of a year"
-        elif turns <= 7:
-            return "about a year"
-        elif turns <= 14:
-            return f"about {turns // 7} years"
-        else:
-            years = turns // 7
-            return f"over {years} years"
+        return f"over {turns // 7} years"
     
     def to_dict(self) -> Dict:
         """Serialize era state"""
@@ -121,7 +127,12 @@ class EraState:
         return era
 
 
-@dataclass
+# GameState lists that only grow between era changes - delta saves send
+# just their new entries
+DELTA_APPEND_FIELDS = ("conversation_history", "game_events", "era_history")
+
+
+@dataclass(slots=True)
 class GameState:
     """
     Complete game state.
@@ -163,9 +174,21 @@ class GameState:
     # AI conversation history for current era (needed for narrative continuity)
     conversation_history: List[Dict] = field(default_factory=list)
     
+    # Narrator's summary of turns evicted from the API window, so a load
+    # doesn't have to re-summarize the whole era (see NarrativeEngine)
+    narrator_memory: Dict = field(default_factory=dict)
+    
     # Unified event log for ending generation (persists across eras)
     game_events: List[Dict] = field(default_factory=list)
     
+    # What the last save covered, for delta saves (not persisted)
+    _save_marks: Dict = field(default_factory=dict, repr=False, compare=False)
+    
+    # game_events grouped by type and by era, built lazily by _index_events (not persisted)
+    _events_by_type: Dict = field(default_factory=dict, repr=False, compare=False)
+    _events_by_era: Dict = field(default_factory=dict, repr=False, compare=False)
+    _events_indexed: tuple = field(default=(None, 0), repr=False, compare=False)
+    
     def start_game(self, player_name: str, mode: GameMode, region: RegionPreference = RegionPreference.WORLDWIDE):
         """Initialize a new game"""
         self.player_name = player_name
@@ -179,7 +202,7 @@ class GameState:
         """Enter a new era"""
         # Save previous era to history if exists
         if self.current_era:
-            self._save_era_to_history()
+            self._save_era_to_history(leaving=True)
         
         # Create new era state
         self.current_era = EraState(
@@ -206,6 +229,7 @@ class GameState:
         
         # Clear conversation history for new era
         self.conversation_history = []
+        self.narrator_memory = {}
         
         # Note: game_events is NOT cleared - it persists across eras
         # to capture the full journey for ending generation
@@ -246,38 +270,50 @@ class GameState:
         self.game_events.append(event)
     
     def get_events_by_type(self, event_type: str) -> List[Dict]:
-        """Retrieve all events of a specific type."""
-        return [e for e in self.game_events if e["type"] == event_type]
+        """Retrieve all events of a specific type (read-only list)."""
+        self._index_events()
+        return self._events_by_type.get(event_type, [])
+    
+    def get_event_types(self) -> set:
+        """Distinct event types logged so far."""
+        self._index_events()
+        return set(self._events_by_type)
+    
+    def _index_events(self):
+        """
+        Bring the per-type and per-era indexes up to date with game_events.
+        
+        Only events appended since the last call are indexed; the index is
+        rebuilt if game_events was replaced (e.g. by a load) or shrank.
+        """
+        events = self.game_events
+        indexed_list, count = self._events_indexed
+        if indexed_list is not events or count > len(events):
+            self._events_by_type = {}
+            self._events_by_era = {}
+            count = 0
+        by_type = self._events_by_type
+        by_era = self._events_by_era
+        for event in events[count:]:
+            by_type.setdefault(event["type"], []).append(event)
+            by_era.setdefault(event.get("era_id"), []).append(event)
+        self._events_indexed = (events, len(events))
     
     def get_recent_events(self, count: int = 10) -> List[Dict]:
         """Get the most recent events across all types."""
         return self.game_events[-count:] if self.game_events else []
     
     def get_events_for_era(self, era_id: str) -> List[Dict]:
-        """Get all events that occurred in a specific era."""
-        return [e for e in self.game_events if e.get("era_id") == era_id]
+        """Get all events that occurred in a specific era (read-only list)."""
+        self._index_events()
+        return self._events_by_era.get(era_id, [])
     
     # =========================================================================
     # TURN AND PHASE MANAGEMENT
     # =========================================================================
     
-    def advance_turn(self) -> Dict[str, Any]:
-        """
-        Advance one turn and return events that occurred.
-        
-        Returns dict with:
-        - window_opened: bool - Window just opened THIS turn
-        - window_closing: bool - Window is on its last turn
-        - window_closed: bool - Window just closed (player let it expire)
-        - window_active_after_turn: bool - Window is active after this turn
-        """
-        events = {
-            "window_opened": False,
-            "window_closing": False,
-            "window_closed": False,
-            "window_active_after_turn": False
-        }
-        
+    def advance_turn(self) -> TurnEvents:
+        """Advance one turn and return the window events that occurred."""
         # Track if window was already open
         was_active = self.time_machine.window_active
         
@@ -289,20 +325,19 @@ class GameState:
         
         # Check time machine - this may open or close the window
         window_opened = self.time_machine.advance_turn()
+        window_closed = window_closing = False
         
         if window_opened:
-            events["window_opened"] = True
             self.phase = GamePhase.WINDOW_OPEN
         elif was_active and not self.time_machine.window_active:
-            events["window_closed"] = True
+            window_closed = True
             self.phase = GamePhase.LIVING
         elif self.time_machine.window_active and self.time_machine.window_turns_remaining == 1:
-            events["window_closing"] = True
-        
-        # Set authoritative post-turn window state
-        events["window_active_after_turn"] = self.time_machine.window_active
+            window_closing = True
         
-        return events
+        # Authoritative post-turn window state
+        return TurnEvents(window_opened, window_closing, window_closed,
+                          self.time_machine.window_active)
     
     def choose_to_stay(self, is_final: bool = False):
         """Player chooses to stay in current era"""
@@ -331,18 +366,25 @@ class GameState:
         self.phase = GamePhase.ENDED
         self.ended_at = datetime.now()
     
-    def _save_era_to_history(self):
-        """Save current era state to history"""
-        if not self.current_era:
+    def _save_era_to_history(self, leaving: bool = False):
+        """
+        Save current era state to history.
+        
+        When leaving, the era is about to be replaced, so history takes its
+        lists as they are; otherwise (end of game) the era stays current
+        and history gets copies.
+        """
+        era = self.current_era
+        if not era:
             return
         
         self.era_history.append({
-            "era_id": self.current_era.era_id,
-            "era_name": self.current_era.era_name,
-            "turns": self.current_era.turns_in_era,
-            "character_name": self.current_era.character_name,
-            "relationships": self.current_era.relationships.copy(),
-            "events": self.current_era.events.copy(),
+            "era_id": era.era_id,
+            "era_name": era.era_name,
+            "turns": era.turns_in_era,
+            "character_name": era.character_name,
+            "relationships": era.relationships if leaving else era.relationships.copy(),
+            "events": era.events if leaving else era.events.copy(),
             "fulfillment_snapshot": {
                 "belonging": self.fulfillment.belonging.value,
                 "legacy": self.fulfillment.legacy.value,
@@ -365,6 +407,24 @@ class GameState:
         """Number of eras visited"""
         return len(self.time_machine.eras_visited)
     
+    def fingerprint(self) -> tuple:
+        """
+        Hashable summary of the fields that shape the system prompt.
+        Two states with the same fingerprint render the same prompt for an era.
+        """
+        fs = self.fulfillment.get_narrative_state()
+        return (
+            self.mode.value,
+            self.current_era.time_in_era_description if self.current_era else None,
+            tuple((i.id, i.uses, i.is_depleted, i.is_revealed) for i in self.inventory.modern_items),
+            tuple((h['era_name'], h['turns'], h.get('character_name')) for h in self.era_history),
+            tuple((fs[a]['level'], fs[a]['recent_trend']) for a in ('belonging', 'legacy', 'freedom')),
+            fs['can_stay'],
+            fs['dominant_anchor'],
+            self.time_machine.indicator.value,
+            self.time_machine.window_active,
+        )
+    
     def get_narrative_context(self) -> Dict:
         """
         Get full context for AI narrator.
@@ -402,6 +462,9 @@ class GameState:
     
     def to_save_dict(self) -> Dict:
         """Serialize complete game state for saving"""
+        tm = self.time_machine
+        display = tm.display
+        ff = self.fulfillment
         return {
             "version": "1.1",  # Bumped version - removed snapshot
             "saved_at": datetime.now().isoformat(),
@@ -428,34 +491,34 @@ class GameState:
             
             # Time machine state
             "time_machine": {
-                "turns_since_last_window": self.time_machine.turns_since_last_window,
-                "window_active": self.time_machine.window_active,
-                "window_turns_remaining": self.time_machine.window_turns_remaining,
-                "eras_visited": self.time_machine.eras_visited,
-                "total_turns": self.time_machine.total_turns,
-                "_accumulated_probability": self.time_machine._accumulated_probability,
+                "turns_since_last_window": tm.turns_since_last_window,
+                "window_active": tm.window_active,
+                "window_turns_remaining": tm.window_turns_remaining,
+                "eras_visited": tm.eras_visited,
+                "total_turns": tm.total_turns,
+                "_accumulated_probability": tm._accumulated_probability,
                 "display": {
-                    "current_year": self.time_machine.display.current_year,
-                    "current_location": self.time_machine.display.current_location,
-                    "current_era_name": self.time_machine.display.current_era_name
+                    "current_year": display.current_year,
+                    "current_location": display.current_location,
+                    "current_era_name": display.current_era_name
                 }
             },
             
             # Fulfillment state
             "fulfillment": {
                 "belonging": {
-                    "value": self.fulfillment.belonging.value,
-                    "history": self.fulfillment.belonging.history
+                    "value": ff.belonging.value,
+                    "history": ff.belonging.history
                 },
                 "legacy": {
-                    "value": self.fulfillment.legacy.value,
-                    "history": self.fulfillment.legacy.history
+                    "value": ff.legacy.value,
+                    "history": ff.legacy.history
                 },
                 "freedom": {
-                    "value": self.fulfillment.freedom.value,
-                    "history": self.fulfillment.freedom.history
+                    "value": ff.freedom.value,
+                    "history": ff.freedom.history
                 },
-                "current_turn": self.fulfillment.current_turn
+                "current_turn": ff.current_turn
             },
             
             # Inventory state
@@ -476,11 +539,63 @@ class GameState:
             "last_narrative": self.last_narrative,
             "last_choices": self.last_choices,
             "conversation_history": self.conversation_history,
+            "narrator_memory": self.narrator_memory,
             
             # Event log for ending generation
             "game_events": self.game_events
         }
     
+    def mark_saved(self, full: bool):
+        """
+        Record what has been persisted so the next save can be a delta.
+        For append-only lists, keep the length and last element so a reset
+        list (new era) is detected rather than mistaken for growth.
+        """
+        lists = {}
+        for key in DELTA_APPEND_FIELDS:
+            items = getattr(self, key)
+            lists[key] = (len(items), items[-1] if items else None)
+        
+        self._save_marks = {
+            "deltas": 0 if full else self._save_marks.get("deltas", 0) + 1,
+            "lists": lists,
+        }
+    
+    @property
+    def deltas_since_full_save(self) -> int:
+        """Number of delta saves written since the last full save"""
+        return self._save_marks.get("deltas", 0)
+    
+    def to_delta(self) -> Optional[Dict]:
+        """
+        Serialize only what changed since the last save.
+        
+        Small fields are sent whole; append-only lists (conversation,
+        events, era history) only send their new tail together with the
+        length it starts at. Returns None when a full save is required
+        (nothing saved yet this session, or a list was reset).
+        """
+        marks = self._save_marks.get("lists")
+        if not marks:
+            return None
+        
+        fields = self.to_save_dict()
+        appends = {}
+        base_lengths = {}
+        for key in DELTA_APPEND_FIELDS:
+            items = fields.pop(key)
+            base, last = marks[key]
+            if len(items) < base or (base and items[base - 1] != last):
+                return None
+            appends[key] = items[base:]
+            base_lengths[key] = base
+        
+        return {
+            "fields": fields,
+            "appends": appends,
+            "base_lengths": base_lengths,
+        }
+    
     @classmethod
     def from_save_dict(cls, data: Dict) -> "GameState":
         """Deserialize game state from save data"""
@@ -555,6 +670,7 @@ class GameState:
         state.last_narrative = data.get("last_narrative", "")
         state.last_choices = data.get("last_choices", [])
         state.conversation_history = data.get("conversation_history", [])
+        state.narrator_memory = data.get("narrator_memory", {})
         
         # Event log
         state.game_events = data.get("game_events", [])
@@ -22,12 +22,26 @@ CREATE TABLE IF NOT EXISTS game_saves (
     current_era VARCHAR,
     phase VARCHAR,
     state JSONB NOT NULL,
+    conversation_blob BYTEA,
     saved_at TIMESTAMP DEFAULT NOW(),
     started_at TIMESTAMP
 );
 
 CREATE INDEX IF NOT EXISTS idx_game_saves_user ON game_saves(user_id);
 CREATE INDEX IF NOT EXISTS idx_game_saves_user_game ON game_saves(user_id, game_id);
+CREATE INDEX IF NOT EXISTS idx_game_saves_user_saved ON game_saves(user_id, saved_at DESC);
+
+-- Per-turn delta saves, replayed on top of game_saves.state at load time
+CREATE TABLE IF NOT EXISTS game_state_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    user_id VARCHAR NOT NULL,
+    game_id VARCHAR NOT NULL,
+    turn_no INTEGER NOT NULL,
+    delta JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_game_state_deltas_game ON game_state_deltas(user_id, game_id, id);
 
 -- Leaderboard entries table
 CREATE TABLE IF NOT EXISTS leaderboard_entries (
@@ -50,6 +64,7 @@ CREATE TABLE IF NOT EXISTS leaderboard_entries (
 
 CREATE INDEX IF NOT EXISTS idx_leaderboard_user ON leaderboard_entries(user_id);
 CREATE INDEX IF NOT EXISTS idx_leaderboard_total ON leaderboard_entries(total_score);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_game ON leaderboard_entries(game_id) WHERE game_id IS NOT NULL;
 
 -- Game histories table
 CREATE TABLE IF NOT EXISTS game_histories (
@@ -67,6 +82,7 @@ CREATE TABLE IF NOT EXISTS game_histories (
 
 CREATE INDEX IF NOT EXISTS idx_game_histories_user ON game_histories(user_id);
 CREATE INDEX IF NOT EXISTS idx_game_histories_game ON game_histories(game_id);
+CREATE INDEX IF NOT EXISTS idx_game_histories_user_ended ON game_histories(user_id, ended_at DESC);
 
 -- Annals of Anachron entries table
 CREATE TABLE IF NOT EXISTS aoa_entries (
@@ -97,6 +113,8 @@ CREATE TABLE IF NOT EXISTS aoa_entries (
 CREATE INDEX IF NOT EXISTS idx_aoa_user ON aoa_entries(user_id);
 CREATE INDEX IF NOT EXISTS idx_aoa_created ON aoa_entries(created_at);
 CREATE INDEX IF NOT EXISTS idx_aoa_entry_id ON aoa_entries(entry_id);
+CREATE INDEX IF NOT EXISTS idx_aoa_game ON aoa_entries(game_id) WHERE game_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_aoa_user_created ON aoa_entries(user_id, created_at DESC);
 
 -- Sessions table (for auth)
 CREATE TABLE IF NOT EXISTS sessions (
@@ -149,8 +167,9 @@ CREATE TABLE IF NOT EXISTS lab_snapshots (
 
 CREATE INDEX IF NOT EXISTS idx_lab_snapshots_user ON lab_snapshots(user_id);
 CREATE INDEX IF NOT EXISTS idx_lab_snapshots_era ON lab_snapshots(era_id);
-CREATE INDEX IF NOT EXISTS idx_lab_snapshots_tags ON lab_snapshots USING GIN(tags);
+CREATE INDEX IF NOT EXISTS idx_lab_snapshots_tags_path ON lab_snapshots USING GIN(tags jsonb_path_ops);
 CREATE INDEX IF NOT EXISTS idx_lab_snapshots_created ON lab_snapshots(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_lab_snapshots_user_created ON lab_snapshots(user_id, created_at DESC);
 
 -- Lab generations: every AI narrative generation with params and parsed results
 CREATE TABLE IF NOT EXISTS lab_generations (
@@ -186,6 +205,7 @@ CREATE INDEX IF NOT EXISTS idx_lab_generations_comparison ON lab_generations(com
 CREATE INDEX IF NOT EXISTS idx_lab_generations_rating ON lab_generations(rating);
 CREATE INDEX IF NOT EXISTS idx_lab_generations_model ON lab_generations(model);
 CREATE INDEX IF NOT EXISTS idx_lab_generations_created ON lab_generations(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_lab_generations_user_created ON lab_generations(user_id, created_at DESC);
 
 -- Lab prompt variants: saved prompt template variations with version control
 CREATE TABLE IF NOT EXISTS lab_prompt_variants (
@@ -342,6 +362,24 @@ ALTER TABLE lab_quickplay_turns ADD COLUMN IF NOT EXISTS choices JSONB DEFAULT '
 -- Migration: Add portrait image columns to aoa_entries
 ALTER TABLE aoa_entries ADD COLUMN IF NOT EXISTS portrait_image_path TEXT;
 ALTER TABLE aoa_entries ADD COLUMN IF NOT EXISTS portrait_prompt TEXT;
+
+-- Migration: Store conversation_history compressed outside the JSONB state
+ALTER TABLE game_saves ADD COLUMN IF NOT EXISTS conversation_blob BYTEA;
+
+-- Migration: Index game_id for the leaderboard/annals joins and per-game updates
+CREATE INDEX IF NOT EXISTS idx_leaderboard_game ON leaderboard_entries(game_id) WHERE game_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_aoa_game ON aoa_entries(game_id) WHERE game_id IS NOT NULL;
+
+-- Migration: Per-user listings filter on user_id and sort newest first
+CREATE INDEX IF NOT EXISTS idx_game_saves_user_saved ON game_saves(user_id, saved_at DESC);
+CREATE INDEX IF NOT EXISTS idx_game_histories_user_ended ON game_histories(user_id, ended_at DESC);
+CREATE INDEX IF NOT EXISTS idx_aoa_user_created ON aoa_entries(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_lab_snapshots_user_created ON lab_snapshots(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_lab_generations_user_created ON lab_generations(user_id, created_at DESC);
+
+-- Migration: Snapshot tags are only queried with @>, which jsonb_path_ops serves with a smaller index
+CREATE INDEX IF NOT EXISTS idx_lab_snapshots_tags_path ON lab_snapshots USING GIN(tags jsonb_path_ops);
+DROP INDEX IF EXISTS idx_lab_snapshots_tags;
 """
 
 def init_db():
@@ -7,13 +7,13 @@ Manages the player's items:
 
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict
-from copy import deepcopy
+from functools import lru_cache
 import re
 
 from config import STARTING_ITEMS
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """A single item in the player's inventory"""
     
@@ -46,11 +46,6 @@ class Item:
         """Does this item have limited uses?"""
         return self.max_uses is not None
     
-    @property
-    def is_modern(self) -> bool:
-        """Is this a modern item from the future?"""
-        return True  # All items are modern now
-    
     def use(self, count: int = 1) -> bool:
         """Use the item. Returns True if successful."""
         if self.is_depleted:
@@ -85,12 +80,11 @@ class Item:
             "uses_remaining": self.uses_remaining,
             "is_depleted": self.is_depleted,
             "is_revealed": self.is_revealed,
-            "is_modern": self.is_modern,
             "times_used": self.times_used
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Inventory:
     """Player's inventory - just the three modern items"""
     
@@ -181,22 +175,46 @@ def get_items_prompt_section(inventory: Inventory) -> str:
     # Modern items
     lines.append("MODERN ITEMS (from the future):")
     for item in inventory.modern_items:
+        # One string per item, ending in the blank line that separates items
         if item.is_depleted:
-            lines.append(f"  - {item.name}: DEPLETED")
-        else:
-            uses_str = f" ({item.uses} uses left)" if item.uses is not None else ""
-            revealed_str = " - REVEALED in this era" if item.is_revealed else ""
-            lines.append(f"  - {item.name}{uses_str}{revealed_str}")
-            lines.append(f"    {item.description}")
-            lines.append(f"    Utility: {item.utility}")
-            lines.append(f"    Risk: {item.risk}")
-            if item.features:
-                lines.append(f"    Features: {', '.join(item.features)}")
-        lines.append("")
+            lines.append(f"  - {item.name}: DEPLETED\n")
+            continue
+        uses_str = f" ({item.uses} uses left)" if item.uses is not None else ""
+        revealed_str = " - REVEALED in this era" if item.is_revealed else ""
+        features_str = f"\n    Features: {', '.join(item.features)}" if item.features else ""
+        lines.append(
+            f"  - {item.name}{uses_str}{revealed_str}\n"
+            f"    {item.description}\n"
+            f"    Utility: {item.utility}\n"
+            f"    Risk: {item.risk}{features_str}\n"
+        )
     
     return "\n".join(lines)
 
 
+# Words that suggest an item is being used when they appear near its name
+_USE_INDICATORS = (
+    "use", "used", "using", "uses",
+    "take out", "took out", "pulls out", "pull out",
+    "show", "showed", "showing", "shows",
+    "give", "gave", "giving", "gives",
+    "consult", "consulted", "check", "checked",
+    "swallow", "take", "took", "administer",
+    "cut", "cutting", "cuts",
+    "light", "lit", "shine", "shining",
+)
+_USE_INDICATOR_ALT = "|".join(_USE_INDICATORS)
+
+
+@lru_cache(maxsize=None)
+def _item_use_pattern(name_part: str) -> "re.Pattern":
+    """Any use indicator within 50 characters before or after name_part."""
+    part = re.escape(name_part)
+    return re.compile(
+        rf'(?:{_USE_INDICATOR_ALT}).{{0,50}}{part}|{part}.{{0,50}}(?:{_USE_INDICATOR_ALT})'
+    )
+
+
 def parse_item_usage(response: str, inventory: Inventory) -> List[str]:
     """
     Parse AI response to detect item usage.
@@ -205,17 +223,6 @@ def parse_item_usage(response: str, inventory: Inventory) -> List[str]:
     used_items = []
     response_lower = response.lower()
     
-    use_indicators = [
-        "use", "used", "using", "uses",
-        "take out", "took out", "pulls out", "pull out",
-        "show", "showed", "showing", "shows",
-        "give", "gave", "giving", "gives",
-        "consult", "consulted", "check", "checked",
-        "swallow", "take", "took", "administer",
-        "cut", "cutting", "cuts",
-        "light", "lit", "shine", "shining",
-    ]
-    
     for item in inventory.all_items:
         if item.is_depleted:
             continue
@@ -227,11 +234,7 @@ def parse_item_usage(response: str, inventory: Inventory) -> List[str]:
         for name_part in name_parts:
             if len(name_part) < 4:  # Skip short words
                 continue
-            if name_part in response_lower:
-                for indicator in use_indicators:
-                    pattern = rf'{indicator}.{{0,50}}{re.escape(name_part)}|{re.escape(name_part)}.{{0,50}}{indicator}'
-                    if re.search(pattern, response_lower):
-                        used_items.append(item.id)
-                        break
+            if name_part in response_lower and _item_use_pattern(name_part).search(response_lower):
+                used_items.append(item.id)
     
     return list(set(used_items))
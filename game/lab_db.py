@@ -9,13 +9,42 @@ import json
 import logging
 from typing import Optional, List, Dict, Any, Tuple
 
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extras import RealDictCursor, Json, execute_values
 
 from db import get_db
 
 logger = logging.getLogger(__name__)
 
 
+# ==================== Helpers ====================
+
+def _fetch_page(cur, table: str, columns: str, where: str, params: list,
+                limit: int, offset: int) -> Tuple[List[Dict], int]:
+    """
+    One page of rows (newest first) and the total matching count, in one
+    round trip. The count rides along as a scalar subquery rather than
+    COUNT(*) OVER (), so the page itself still stops after LIMIT rows.
+    """
+    cur.execute(
+        f"""SELECT {columns},
+            (SELECT COUNT(*) FROM {table} WHERE {where}) AS total_count
+            FROM {table} WHERE {where}
+            ORDER BY created_at DESC LIMIT %s OFFSET %s""",
+        params + params + [limit, offset]
+    )
+    rows = [dict(r) for r in cur.fetchall()]
+    if not rows:
+        if not offset:
+            return rows, 0
+        # Past the last page there is no row to carry the count
+        cur.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params)
+        return rows, cur.fetchone()['count']
+    total = rows[0]['total_count']
+    for row in rows:
+        del row['total_count']
+    return rows, total
+
+
 # ==================== Snapshots ====================
 
 def save_snapshot(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -77,19 +106,13 @@ def list_snapshots(user_id: str, era_id: str = None, tags: List[str] = None,
 
     with get_db() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(f"SELECT COUNT(*) FROM lab_snapshots WHERE {where}", params)
-            total = cur.fetchone()['count']
-
-            cur.execute(
-                f"""SELECT id, user_id, label, tags, era_id, era_name, era_year, era_location,
-                    total_turns, phase, player_name, belonging_value, legacy_value, freedom_value,
-                    available_choices, source, source_game_id, created_at
-                    FROM lab_snapshots WHERE {where}
-                    ORDER BY created_at DESC LIMIT %s OFFSET %s""",
-                params + [limit, offset]
+            return _fetch_page(
+                cur, "lab_snapshots",
+                """id, user_id, label, tags, era_id, era_name, era_year, era_location,
+                   total_turns, phase, player_name, belonging_value, legacy_value, freedom_value,
+                   available_choices, source, source_game_id, created_at""",
+                where, params, limit, offset
             )
-            rows = [dict(r) for r in cur.fetchall()]
-            return rows, total
 
 
 def update_snapshot(snapshot_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -127,33 +150,61 @@ def delete_snapshot(snapshot_id: str) -> bool:
 
 # ==================== Generations ====================
 
+_GENERATION_INSERT = """
+    INSERT INTO lab_generations
+    (user_id, snapshot_id, choice_id, choice_text, model,
+     system_prompt, turn_prompt, dice_roll, temperature, max_tokens,
+     raw_response, narrative_text, anchor_deltas, parsed_npcs,
+     parsed_wisdom, parsed_character_name, parsed_choices,
+     comparison_group, comparison_label, generation_time_ms)
+    VALUES %s
+    RETURNING *
+"""
+
+
+# Everything the Lab's generation cards show; the system and turn prompts
+# (often several KB per row) are only returned by get_generation
+_GENERATION_LIST_COLUMNS = """
+    id, user_id, snapshot_id, choice_id, choice_text, model,
+    dice_roll, temperature, max_tokens, raw_response, narrative_text,
+    anchor_deltas, parsed_npcs, parsed_wisdom, parsed_character_name,
+    parsed_choices, rating, notes, comparison_group, comparison_label,
+    generation_time_ms, created_at
+"""
+
+
+def _generation_row(data: Dict[str, Any]) -> tuple:
+    return (
+        data['user_id'], data['snapshot_id'], data['choice_id'],
+        data.get('choice_text'), data['model'],
+        data['system_prompt'], data['turn_prompt'],
+        data.get('dice_roll'), data.get('temperature', 1.0),
+        data.get('max_tokens', 1500),
+        data['raw_response'], data.get('narrative_text'),
+        Json(data.get('anchor_deltas')), Json(data.get('parsed_npcs', [])),
+        data.get('parsed_wisdom'), data.get('parsed_character_name'),
+        Json(data.get('parsed_choices', [])),
+        data.get('comparison_group'), data.get('comparison_label'),
+        data.get('generation_time_ms')
+    )
+
+
 def save_generation(data: Dict[str, Any]) -> Dict[str, Any]:
     """Create a lab generation. Returns the created row."""
+    return save_generations([data])[0]
+
+
+def save_generations(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Create several lab generations in one round trip. Returns the
+    created rows in the order given."""
+    if not items:
+        return []
     with get_db() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-                INSERT INTO lab_generations
-                (user_id, snapshot_id, choice_id, choice_text, model,
-                 system_prompt, turn_prompt, dice_roll, temperature, max_tokens,
-                 raw_response, narrative_text, anchor_deltas, parsed_npcs,
-                 parsed_wisdom, parsed_character_name, parsed_choices,
-                 comparison_group, comparison_label, generation_time_ms)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING *
-            """, (
-                data['user_id'], data['snapshot_id'], data['choice_id'],
-                data.get('choice_text'), data['model'],
-                data['system_prompt'], data['turn_prompt'],
-                data.get('dice_roll'), data.get('temperature', 1.0),
-                data.get('max_tokens', 1500),
-                data['raw_response'], data.get('narrative_text'),
-                Json(data.get('anchor_deltas')), Json(data.get('parsed_npcs', [])),
-                data.get('parsed_wisdom'), data.get('parsed_character_name'),
-                Json(data.get('parsed_choices', [])),
-                data.get('comparison_group'), data.get('comparison_label'),
-                data.get('generation_time_ms')
-            ))
-            return dict(cur.fetchone())
+            rows = execute_values(cur, _GENERATION_INSERT,
+                                  [_generation_row(d) for d in items],
+                                  page_size=len(items), fetch=True)
+            return [dict(r) for r in rows]
 
 
 def get_generation(generation_id: str) -> Optional[Dict[str, Any]]:
@@ -189,15 +240,8 @@ def list_generations(user_id: str, snapshot_id: str = None, model: str = None,
 
     with get_db() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(f"SELECT COUNT(*) FROM lab_generations WHERE {where}", params)
-            total = cur.fetchone()['count']
-
-            cur.execute(
-                f"SELECT * FROM lab_generations WHERE {where} ORDER BY created_at DESC LIMIT %s OFFSET %s",
-                params + [limit, offset]
-            )
-            rows = [dict(r) for r in cur.fetchall()]
-            return rows, total
+            return _fetch_page(cur, "lab_generations", _GENERATION_LIST_COLUMNS,
+                               where, params, limit, offset)
 
 
 def update_generation(generation_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -561,24 +605,18 @@ def list_quickplay_turns(user_id: str, session_id: str = None, era_id: str = Non
 
     with get_db() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(f"SELECT COUNT(*) FROM lab_quickplay_turns WHERE {where}", params)
-            total = cur.fetchone()['count']
-
-            cur.execute(
-                f"""SELECT id, session_id, user_id, turn_number, turn_type,
-                    era_id, era_name, era_year, era_location, region,
-                    system_prompt_variant_id, system_prompt_variant_name,
-                    turn_prompt_variant_id, turn_prompt_variant_name,
-                    arrival_prompt_variant_id, arrival_prompt_variant_name,
-                    window_prompt_variant_id, window_prompt_variant_name,
-                    model, temperature, dice_roll,
-                    choice_made, narrative_text, choices, snapshot_id, created_at
-                    FROM lab_quickplay_turns WHERE {where}
-                    ORDER BY created_at DESC LIMIT %s OFFSET %s""",
-                params + [limit, offset]
+            return _fetch_page(
+                cur, "lab_quickplay_turns",
+                """id, session_id, user_id, turn_number, turn_type,
+                   era_id, era_name, era_year, era_location, region,
+                   system_prompt_variant_id, system_prompt_variant_name,
+                   turn_prompt_variant_id, turn_prompt_variant_name,
+                   arrival_prompt_variant_id, arrival_prompt_variant_name,
+                   window_prompt_variant_id, window_prompt_variant_name,
+                   model, temperature, dice_roll,
+                   choice_made, narrative_text, choices, snapshot_id, created_at""",
+                where, params, limit, offset
             )
-            rows = [dict(r) for r in cur.fetchall()]
-            return rows, total
 
 
 def get_quickplay_turn(turn_id: str) -> Optional[Dict[str, Any]]:
@@ -29,8 +29,7 @@ from prompts import (
 )
 from fulfillment import parse_anchor_adjustments, strip_anchor_tags
 from event_parsing import (
-    parse_character_name, parse_key_npcs, parse_wisdom_moment,
-    strip_event_tags
+    parse_all_events, strip_event_tags
 )
 from items import Inventory
 
@@ -253,27 +252,37 @@ def list_all_saves() -> List[Dict[str, Any]]:
 
 # ==================== Generation ====================
 
+_CHOICE_LINE_RE = re.compile(r'^\[([A-C])\]\s*(.+)$', re.IGNORECASE)
+_CHOICE_TRAILING_TAG_RE = re.compile(r'\s*<[^>]+>.*$')
+_CHOICE_TRAILING_SCORES_RE = re.compile(r'\s*SCORES:.*$', re.IGNORECASE)
+
+
 def _parse_choices_from_response(response: str) -> List[Dict]:
     """Extract [A]/[B]/[C] choices from AI response. Replicates GameAPI._parse_choices logic."""
     clean = strip_anchor_tags(response)
     clean = strip_event_tags(clean)
     # Strip markdown bold markers so **[A]** still matches
-    clean = re.sub(r'\*\*', '', clean)
+    clean = clean.replace('**', '')
 
     choices = []
     for line in clean.split('\n'):
         line = line.strip()
-        match = re.match(r'^\[([A-C])\]\s*(.+)$', line, re.IGNORECASE)
+        # Cheap prefilter: only choice lines start with '['
+        if not line.startswith('['):
+            continue
+        match = _CHOICE_LINE_RE.match(line)
         if match:
             choice_text = match.group(2).strip()
-            choice_text = re.sub(r'\s*<[^>]+>.*$', '', choice_text)
-            choice_text = re.sub(r'\s*SCORES:.*$', '', choice_text, flags=re.IGNORECASE)
+            choice_text = _CHOICE_TRAILING_TAG_RE.sub('', choice_text)
+            choice_text = _CHOICE_TRAILING_SCORES_RE.sub('', choice_text)
             if choice_text and len(choice_text) > 3:
                 choices.append({
                     'id': match.group(1).upper(),
                     'text': choice_text
                 })
-    return choices[:3]
+                if len(choices) == 3:
+                    break
+    return choices
 
 
 def generate_narrative(user_id: str, snapshot_id: str, choice_id: str,
@@ -297,6 +306,29 @@ def generate_narrative(user_id: str, snapshot_id: str, choice_id: str,
     if not snapshot:
         raise ValueError(f"Snapshot not found: {snapshot_id}")
 
+    generation_data = _run_generation(
+        user_id, snapshot, choice_id, model=model,
+        system_prompt_override=system_prompt_override,
+        turn_prompt_override=turn_prompt_override,
+        dice_roll=dice_roll, temperature=temperature, max_tokens=max_tokens,
+        comparison_group=comparison_group, comparison_label=comparison_label,
+    )
+    return lab_db.save_generation(generation_data)
+
+
+def _run_generation(user_id: str, snapshot: Dict[str, Any], choice_id: str,
+                    model: str = None,
+                    system_prompt_override: str = None,
+                    turn_prompt_override: str = None,
+                    dice_roll: int = None,
+                    temperature: float = 1.0,
+                    max_tokens: int = 1500,
+                    comparison_group: str = None,
+                    comparison_label: str = None) -> Dict[str, Any]:
+    """Call the model for one generation and return the row to store
+    (not yet saved)."""
+    snapshot_id = snapshot['id']
+
     # 2. Reconstruct game state
     game_state = GameState.from_save_dict(snapshot['game_state'])
 
@@ -357,9 +389,10 @@ def generate_narrative(user_id: str, snapshot_id: str, choice_id: str,
 
     # 8. Parse response
     anchor_deltas = parse_anchor_adjustments(raw_response)
-    npcs = parse_key_npcs(raw_response)
-    wisdom = parse_wisdom_moment(raw_response)
-    character_name = parse_character_name(raw_response)
+    events = parse_all_events(raw_response)
+    npcs = events["key_npcs"]
+    wisdom = events["wisdom_id"]
+    character_name = events["character_name"]
     parsed_choices = _parse_choices_from_response(raw_response)
 
     # Clean narrative text
@@ -397,7 +430,7 @@ def generate_narrative(user_id: str, snapshot_id: str, choice_id: str,
         'generation_time_ms': elapsed_ms,
     }
 
-    return lab_db.save_generation(generation_data)
+    return generation_data
 
 
 def generate_batch(user_id: str, snapshot_id: str, choice_id: str,
@@ -407,15 +440,22 @@ def generate_batch(user_id: str, snapshot_id: str, choice_id: str,
     Each variant can have different model, prompts, dice_roll, temperature, etc.
     Returns comparison_group ID and all generations.
     """
+    if not ANTHROPIC_AVAILABLE:
+        raise RuntimeError("Anthropic API not available")
+
+    snapshot = lab_db.get_snapshot(snapshot_id)
+    if not snapshot:
+        raise ValueError(f"Snapshot not found: {snapshot_id}")
+
     comparison_group = str(uuid.uuid4())
-    generations = []
+    pending = []
 
     for i, variant in enumerate(variants):
         label = variant.get('label', f"Variant {chr(65 + i)}")
-        gen = generate_narrative(
-            user_id=user_id,
-            snapshot_id=snapshot_id,
-            choice_id=choice_id,
+        gen = _run_generation(
+            user_id,
+            snapshot,
+            choice_id,
             model=variant.get('model'),
             system_prompt_override=variant.get('system_prompt'),
             turn_prompt_override=variant.get('turn_prompt'),
@@ -425,11 +465,12 @@ def generate_batch(user_id: str, snapshot_id: str, choice_id: str,
             comparison_group=comparison_group,
             comparison_label=label,
         )
-        generations.append(gen)
+        pending.append(gen)
 
+    # Store the whole group in one round trip once every variant has come back
     return {
         'comparison_group': comparison_group,
-        'generations': generations,
+        'generations': lab_db.save_generations(pending),
     }
 
 
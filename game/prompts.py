@@ -11,6 +11,8 @@ AI prompts for the narrative system, updated for:
 - Template-based overrides (Narrative Lab)
 """
 
+from typing import Tuple
+
 from game_state import GameState, GameMode, GamePhase
 from items import get_items_prompt_section
 from fulfillment import get_anchor_detection_prompt
@@ -52,7 +54,10 @@ def _get_wisdom_ids_section(era: dict) -> str:
 # SYSTEM PROMPT — Template + Variables
 # =============================================================================
 
-DEFAULT_SYSTEM_TEMPLATE = """You are the narrator for "Anachron," a time-travel survival game.
+# The system prompt is split so that everything fixed for an era comes first.
+# The static prefix is sent with a cache_control marker; the dynamic suffix
+# (time in era, inventory, fulfillment, device) changes between calls.
+DEFAULT_SYSTEM_STATIC_TEMPLATE = """You are the narrator for "Anachron," a time-travel survival game.
 
 GAME MODE: {game_mode}
 
@@ -62,7 +67,6 @@ SETTING:
 - Era: {era_name}
 - Year: {era_year}
 - Location: {era_location}
-- Time in era: {time_in_era}
 
 HISTORICAL CONSTRAINTS:
 {hard_rules_text}
@@ -73,12 +77,6 @@ KEY EVENTS HAPPENING:
 HISTORICAL FIGURES:
 {figures_text}
 
-{items_section}
-
-{era_history}
-
-{fulfillment_context}
-
 THE TIME MACHINE:
 The player wears a small device on their wrist, hidden under their sleeve. It looks like an unusual
 watch or bracelet. It has a small display showing the current date and location, and an indicator
@@ -95,13 +93,10 @@ traps the player, creates temporal loops, or fails in any way. When the player c
 - No "botched escapes", "incomplete activations", or "device damage"
 The drama is in WHAT THEY LEAVE BEHIND, not in whether the device works.
 
-Current indicator: {indicator_value}
-Window status: {window_status}
-
 ITEM TRACKING (CRITICAL):
 The game tracks items separately from narrative. If items appear to be lost, damaged, or stolen in
 the story, they are NOT actually removed from the player's inventory unless they choose to use them.
-The items listed in the INVENTORY section are the TRUE items the player has - do NOT narrate them
+The items listed in the INVENTORY section below are the TRUE items the player has - do NOT narrate them
 being permanently lost or destroyed. They can be temporarily unavailable in a scene, but they persist.
 
 {anchor_prompt}
@@ -197,6 +192,21 @@ from everyone else in the era - use it organically but regularly.
 Remember: The goal is "finding happiness" - helping the player discover what that means for them
 through their choices across history."""
 
+DEFAULT_SYSTEM_DYNAMIC_TEMPLATE = """
+
+CURRENT SITUATION:
+- Time in era: {time_in_era}
+- Current indicator: {indicator_value}
+- Window status: {window_status}
+
+{items_section}
+
+{era_history}
+
+{fulfillment_context}"""
+
+DEFAULT_SYSTEM_TEMPLATE = DEFAULT_SYSTEM_STATIC_TEMPLATE + DEFAULT_SYSTEM_DYNAMIC_TEMPLATE
+
 
 def _get_system_variables(game_state: GameState, era: dict) -> dict:
     """Compute all dynamic variables for the system prompt template."""
@@ -304,9 +314,26 @@ def get_system_prompt(game_state: GameState, era: dict) -> str:
     This sets up the entire context and rules for narrative generation.
     Uses template override from Narrative Lab if one is active.
     """
+    static_prefix, dynamic_suffix = get_system_prompt_parts(game_state, era)
+    return static_prefix + dynamic_suffix
+
+
+def get_system_prompt_parts(game_state: GameState, era: dict) -> Tuple[str, str]:
+    """
+    Generate the system prompt as (static_prefix, dynamic_suffix).
+
+    The prefix only depends on the era and game mode, so it can be marked
+    for prompt caching. A Narrative Lab override is returned whole as the
+    prefix since its layout is unknown.
+    """
     variables = _get_system_variables(game_state, era)
-    template = get_active_template("system") or DEFAULT_SYSTEM_TEMPLATE
-    return template.format(**variables)
+    override = get_active_template("system")
+    if override:
+        return override.format(**variables), ""
+    return (
+        DEFAULT_SYSTEM_STATIC_TEMPLATE.format(**variables),
+        DEFAULT_SYSTEM_DYNAMIC_TEMPLATE.format(**variables),
+    )
 
 
 # =============================================================================
@@ -116,8 +116,7 @@ def add_leaderboard():
             return jsonify({'error': 'Missing required fields'}), 400
 
         result = storage.add_leaderboard_entry(entry)
-        rank = storage.get_rank(result.get('total_score', 0))
-        return jsonify({'success': True, 'id': result['id'], 'rank': rank})
+        return jsonify({'success': True, 'id': result['id'], 'rank': result['rank']})
     except Exception as e:
         logger.error(f"Add leaderboard error: {e}")
         return jsonify({'error': 'Failed to add leaderboard entry'}), 500
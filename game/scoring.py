@@ -23,7 +23,33 @@ AOA_THRESHOLDS = {
     "min_turns": 15,           # Minimum turns to qualify
     "min_eras": 1,             # Minimum eras visited
     "min_fulfillment": 30,     # Minimum total fulfillment (belonging + legacy + freedom)
-    "excluded_endings": ["abandoned"]  # Endings that don't qualify
+    "excluded_endings": frozenset({"abandoned"})  # Endings that don't qualify
+}
+
+
+def meets_aoa_thresholds(ending_type: str, turns_survived: int, eras_visited: int,
+                         total_fulfillment: int) -> bool:
+    """Check a finished game's numbers against AOA_THRESHOLDS"""
+    return (
+        ending_type not in AOA_THRESHOLDS["excluded_endings"]
+        and turns_survived >= AOA_THRESHOLDS["min_turns"]
+        and eras_visited >= AOA_THRESHOLDS["min_eras"]
+        and total_fulfillment >= AOA_THRESHOLDS["min_fulfillment"]
+    )
+
+
+# =============================================================================
+# ENDING BONUSES
+# =============================================================================
+
+ENDING_BONUSES = {
+    "complete": 200,      # All three anchors high
+    "balanced": 150,      # Two anchors high
+    "belonging": 100,     # Found community
+    "legacy": 100,        # Built something lasting
+    "freedom": 100,       # Found independence
+    "searching": 50,      # Chose to stay without fulfillment
+    "abandoned": 25       # Quit before finding happiness
 }
 
 
@@ -74,16 +100,7 @@ class Score:
     @property
     def ending_bonus(self) -> int:
         """Bonus points based on ending type"""
-        bonuses = {
-            "complete": 200,      # All three anchors high
-            "balanced": 150,      # Two anchors high
-            "belonging": 100,     # Found community
-            "legacy": 100,        # Built something lasting
-            "freedom": 100,       # Found independence
-            "searching": 50,      # Chose to stay without fulfillment
-            "abandoned": 25       # Quit before finding happiness
-        }
-        return bonuses.get(self.ending_type, 25)
+        return ENDING_BONUSES.get(self.ending_type, 25)
     
     @property
     def total(self) -> int:
@@ -276,16 +293,10 @@ class AoAEntry:
     
     def qualifies_for_aoa(self) -> bool:
         """Check if this entry meets AoA qualification thresholds"""
-        if self.ending_type in AOA_THRESHOLDS["excluded_endings"]:
-            return False
-        if self.turns_survived < AOA_THRESHOLDS["min_turns"]:
-            return False
-        if self.eras_visited < AOA_THRESHOLDS["min_eras"]:
-            return False
-        total_fulfillment = self.belonging_score + self.legacy_score + self.freedom_score
-        if total_fulfillment < AOA_THRESHOLDS["min_fulfillment"]:
-            return False
-        return True
+        return meets_aoa_thresholds(
+            self.ending_type, self.turns_survived, self.eras_visited,
+            self.belonging_score + self.legacy_score + self.freedom_score
+        )
     
     def get_share_text(self) -> str:
         """Generate shareable text summary"""
@@ -571,12 +582,15 @@ class AnnalsOfAnachron:
         
         Returns None if the game doesn't qualify for AoA.
         """
-        entry = AoAEntry.from_game_state(game_state, score)
-        
-        if not entry.qualifies_for_aoa():
+        # The thresholds only use score fields, so check them before
+        # building the entry (which walks the event log)
+        if not meets_aoa_thresholds(
+            score.ending_type, score.turns_survived, score.eras_visited,
+            score.belonging_score + score.legacy_score + score.freedom_score
+        ):
             return None
         
-        return entry
+        return AoAEntry.from_game_state(game_state, score)
     
     def save_entry(self, entry: AoAEntry) -> bool:
         """Save an entry to the archive"""
@@ -217,8 +217,7 @@ def handle_enter_first_era():
         return
     
     session = session_data['session']
-    messages = session.enter_first_era()
-    for msg in messages:
+    for msg in session.enter_first_era_stream():
         emit('message', msg)
 
 
@@ -232,8 +231,7 @@ def handle_choose(data):
     
     session = session_data['session']
     choice = data.get('choice', 'A')
-    messages = session.choose(choice)
-    for msg in messages:
+    for msg in session.choose_stream(choice):
         emit('message', msg)
 
 
@@ -246,8 +244,7 @@ def handle_continue_to_next_era():
         return
     
     session = session_data['session']
-    messages = session.continue_to_next_era()
-    for msg in messages:
+    for msg in session.continue_to_next_era_stream():
         emit('message', msg)
 
 
@@ -260,8 +257,7 @@ def handle_continue_to_score():
         return
     
     session = session_data['session']
-    messages = session.continue_to_score()
-    for msg in messages:
+    for msg in session.continue_to_score_stream():
         emit('message', msg)
 
 
@@ -233,8 +233,8 @@ def select_random_era(available_eras: list, exclude_ids: list = None) -> dict:
     eligible = [e for e in available_eras if e["id"] not in exclude_ids]
     
     if not eligible:
-        # All eras visited - allow revisits
-        eligible = available_eras
+        # All eras visited - allow revisits (copy: the pool may be shared)
+        eligible = list(available_eras)
     
     # Shuffle then pick first - extra randomization
     random.shuffle(eligible)